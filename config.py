@@ -20,11 +20,20 @@ CUSTOM_API_ENDPOINTS = {
 PROJECT_ID = os.getenv("GOOGLE_CLOUD_PROJECT_ID", "your-project-id")
 DATASET_ID = "supply_chain_analytics"
 LOCATION = "US"
+BIGQUERY_HTTP_POOL_SIZE = 16  # connections shared by concurrent table loads
+STORAGE_WRITE_BATCH_ROWS = 10000  # rows per Storage Write append request
+MART_REFRESH_WINDOW_DAYS = None  # days of fact history scanned by the data marts (None: all)
 
 # Data Sources
 DATA_DIR = "./data"
 EXCEL_FILE_PATH = "test.xlsx"  # Updated to use test.xlsx as primary dataset
 
+# API Server Settings
+GZIP_MIN_BYTES = 1024  # smaller JSON responses are sent uncompressed
+API_HOST = os.getenv("HOST", "0.0.0.0")
+API_PORT = int(os.getenv("PORT", "5000"))
+API_DEBUG = os.getenv("FLASK_DEBUG") == "1"  # debugger + reloader re-import and reload the data
+
 # Simulation Settings
 INVENTORY_SIMULATION_DAYS = 30
 RESTOCKING_FREQUENCY = 7  # days
@@ -46,10 +55,14 @@ FILL_RATE_THRESHOLDS = {
 # Dashboard Configuration
 DASHBOARD_TITLE = "Supply Chain Analytics Dashboard"
 DASHBOARD_THEME = "light"
+CHART_MAX_POINTS = 2000  # time series are LTTB-downsampled to at most this many points per trace
 
 # Logging Configuration
 LOG_LEVEL = "INFO"
 LOG_FILE = "supply_chain_pipeline.log"
+LOG_MAX_BYTES = 10 * 1024 * 1024  # rotate the log file at 10 MB
+LOG_BACKUP_COUNT = 5
+LOG_TO_CONSOLE = os.getenv("LOG_TO_CONSOLE", "1") == "1"  # set to 0 to log to the file only
 
 # Alert Thresholds
 INVENTORY_ALERT_THRESHOLD = 0.1  # 10% of max stock
@@ -0,0 +1,14 @@
+"""
+Shared st.cache_data settings for the standalone dashboard
+"""
+
+import pandas as pd
+
+def hash_dataframe(df):
+    """
+    Cache key for a DataFrame from one vectorized pass over its rows
+    """
+    return tuple(df.columns), int(pd.util.hash_pandas_object(df, index=False).sum())
+
+# Pass as @st.cache_data(hash_funcs=DF_HASH) on helpers taking DataFrames
+DF_HASH = {pd.DataFrame: hash_dataframe}
@@ -0,0 +1,205 @@
+"""
+Cached Plotly figures for the standalone dashboard (run_dashboard.py)
+Imported lazily where the charts are drawn, so plotly loads only then
+"""
+
+import streamlit as st
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from config import CHART_MAX_POINTS
+from dashboard.caching import DF_HASH
+
+# Encode figures with orjson (numpy arrays serialized natively)
+pio.json.config.default_engine = 'orjson'
+
+def lttb_indices(x, y, n_out):
+    """
+    Pick the indices of n_out points that keep the visual shape of a series
+    (Largest-Triangle-Three-Buckets); x and y are numeric arrays sorted by x
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    
+    # The first and last points are always kept; the rest are split into
+    # n_out - 2 buckets and each keeps the point forming the largest
+    # triangle with the previous pick and the next bucket's average
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[stop:next_stop].mean()
+        avg_y = y[stop:next_stop].mean()
+        
+        area = np.abs((x[a] - avg_x) * (y[start:stop] - y[a])
+                      - (x[a] - x[start:stop]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    
+    return selected
+
+@st.cache_data(hash_funcs=DF_HASH)
+def daily_inventory_levels(sample_inventory):
+    """
+    Mean stock level and demand per day and category, downsampled per
+    category to CHART_MAX_POINTS for plotting
+    """
+    daily_inventory = sample_inventory.groupby(['date', 'category'], as_index=False, observed=True)[
+        ['stock_level', 'daily_demand']
+    ].mean()
+    
+    keep = [
+        group.index[lttb_indices(group['date'].to_numpy().astype(np.int64),
+                                 group['stock_level'].to_numpy(), CHART_MAX_POINTS)]
+        for _, group in daily_inventory.groupby('category', observed=True)
+    ]
+    return daily_inventory.loc[np.sort(np.concatenate(keep))]
+
+@st.cache_data(hash_funcs=DF_HASH)
+def category_sales_summary(sample_orders):
+    """
+    Total sales and order count per category
+    """
+    return sample_orders.groupby('Category', as_index=False, observed=True).agg(
+        Sales=('Sales', 'sum'),
+        Orders=('Order ID', 'count')
+    )
+
+@st.cache_data(hash_funcs=DF_HASH)
+def fill_rate_by_category(sample_inventory):
+    """
+    Mean fill rate per category
+    """
+    return sample_inventory.groupby('category', as_index=False, observed=True)['fill_rate'].mean()
+
+@st.cache_data(hash_funcs=DF_HASH)
+def monthly_lead_time(sample_orders):
+    """
+    Mean lead time per order month, downsampled to CHART_MAX_POINTS for plotting
+    """
+    # Month keys via a datetime64[M] cast rather than per-row Period objects;
+    # labels are formatted once per month
+    order_month = sample_orders['Order Date'].to_numpy().astype('datetime64[M]')
+    lead_time = sample_orders.groupby(order_month)['Lead Time (Days)'].mean()
+    lead_time.index = np.datetime_as_string(lead_time.index.to_numpy().astype('datetime64[M]'), unit='M')
+    
+    keep = lttb_indices(np.arange(len(lead_time)), lead_time.to_numpy(), CHART_MAX_POINTS)
+    return lead_time.iloc[keep]
+
+@st.cache_data(hash_funcs=DF_HASH)
+def lead_time_histogram(sample_orders):
+    """
+    Lead time distribution figure, binned with numpy so only the 20 bar
+    heights are sent to the browser
+    """
+    lead_times = sample_orders['Lead Time (Days)'].dropna().to_numpy()
+    counts, edges = np.histogram(lead_times, bins=20)
+    
+    fig = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges)
+    ))
+    fig.update_layout(
+        title="Lead Time Distribution",
+        xaxis_title="Lead Time (Days)",
+        yaxis_title="Number of Orders",
+        showlegend=False
+    )
+    return fig
+
+@st.cache_data(hash_funcs=DF_HASH)
+def stock_level_chart(sample_inventory):
+    """
+    Daily stock level figure, one line per category
+    """
+    daily_inventory = daily_inventory_levels(sample_inventory)
+    
+    # One WebGL trace per category, fed the aggregate's numpy columns
+    # directly rather than letting px.line re-split and copy the frame
+    fig = go.Figure([
+        go.Scattergl(
+            x=group['date'].to_numpy(),
+            y=group['stock_level'].to_numpy(),
+            mode='lines',
+            name=category
+        )
+        for category, group in daily_inventory.groupby('category', sort=False, observed=True)
+    ])
+    fig.update_layout(
+        title="Daily Stock Levels by Category",
+        legend_title_text='category',
+        xaxis_title="Date",
+        yaxis_title="Stock Level",
+        hovermode='x unified'
+    )
+    return fig
+
+@st.cache_data(hash_funcs=DF_HASH)
+def category_sales_chart(sample_orders):
+    """
+    Sales by category figure
+    """
+    fig = px.bar(
+        category_sales_summary(sample_orders),
+        x='Category',
+        y='Sales',
+        title="Sales by Category",
+        text='Sales'
+    )
+    fig.update_traces(texttemplate='%{text:,.0f}', textposition='outside')
+    fig.update_layout(
+        xaxis_title="Category",
+        yaxis_title="Total Sales ($)",
+        xaxis_tickangle=-45
+    )
+    return fig
+
+@st.cache_data(hash_funcs=DF_HASH)
+def fill_rate_chart(sample_inventory):
+    """
+    Average fill rate by category figure
+    """
+    fig = px.bar(
+        fill_rate_by_category(sample_inventory),
+        x='category',
+        y='fill_rate',
+        title="Average Fill Rate by Category",
+        text='fill_rate'
+    )
+    fig.update_traces(texttemplate='%{text:.1%}', textposition='outside')
+    fig.update_layout(
+        xaxis_title="Category",
+        yaxis_title="Fill Rate",
+        yaxis_tickformat='.1%',
+        xaxis_tickangle=-45
+    )
+    return fig
+
+@st.cache_data(hash_funcs=DF_HASH)
+def monthly_lead_time_chart(sample_orders):
+    """
+    Monthly average lead time figure
+    """
+    lead_time_by_month = monthly_lead_time(sample_orders)
+    
+    fig = px.line(
+        x=lead_time_by_month.index,
+        y=lead_time_by_month.values,
+        title="Monthly Average Lead Time",
+        render_mode='webgl'
+    )
+    fig.update_layout(
+        xaxis_title="Month",
+        yaxis_title="Average Lead Time (Days)"
+    )
+    return fig
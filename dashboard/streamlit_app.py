@@ -3,12 +3,16 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+import plotly.io as pio
 import numpy as np
 from datetime import datetime, timedelta
 import requests
 from utils.logger import log_pipeline_step, log_alert
 from config import DASHBOARD_TITLE, DASHBOARD_THEME, INVENTORY_ALERT_THRESHOLD
 
+# Serialize Plotly figures with orjson instead of the stdlib json module
+pio.json.config.default_engine = 'orjson'
+
 class SupplyChainDashboard:
     """
     Streamlit dashboard for supply chain analytics
@@ -224,7 +228,7 @@ class SupplyChainDashboard:
         
         # Group by date and category
         if 'date' in inventory_df.columns and 'category' in inventory_df.columns:
-            daily_inventory = inventory_df.groupby(['date', 'category']).agg({
+            daily_inventory = inventory_df.groupby(['date', 'category'], observed=True).agg({
                 'stock_level': 'mean',
                 'daily_demand': 'mean'
             }).reset_index()
@@ -258,7 +262,7 @@ class SupplyChainDashboard:
         st.subheader("🏷️ Category Performance")
         
         if 'Category' in orders_df.columns and 'Sales' in orders_df.columns:
-            category_sales = orders_df.groupby('Category').agg({
+            category_sales = orders_df.groupby('Category', observed=True).agg({
                 'Sales': 'sum',
                 'Order ID': 'count'
             }).reset_index()
@@ -295,7 +299,7 @@ class SupplyChainDashboard:
         st.subheader("📈 Fill Rate Analysis")
         
         if 'fill_rate' in inventory_df.columns and 'category' in inventory_df.columns:
-            fill_rate_by_category = inventory_df.groupby('category')['fill_rate'].mean().reset_index()
+            fill_rate_by_category = inventory_df.groupby('category', observed=True)['fill_rate'].mean().reset_index()
             
             fig = px.bar(
                 fill_rate_by_category,
@@ -325,14 +329,12 @@ class SupplyChainDashboard:
         
         alerts = []
         
-        # Check for low inventory
+        # Check for low inventory (count the mask; no filtered copy)
         if 'inventory' in data_dict and len(data_dict['inventory']) > 0:
-            low_stock_products = data_dict['inventory'][
-                data_dict['inventory']['stockout_risk'] == True
-            ]
+            low_stock_count = int(data_dict['inventory']['stockout_risk'].sum())
             
-            if len(low_stock_products) > 0:
-                alerts.append(f"⚠️ {len(low_stock_products)} products at risk of stockout")
+            if low_stock_count > 0:
+                alerts.append(f"⚠️ {low_stock_count} products at risk of stockout")
         
         # Check for missing data
         if 'orders' in data_dict and len(data_dict['orders']) > 0:
@@ -342,9 +344,9 @@ class SupplyChainDashboard:
         
         # Check for high lead times
         if 'orders' in data_dict and 'Lead Time (Days)' in data_dict['orders'].columns:
-            high_lead_time = data_dict['orders'][data_dict['orders']['Lead Time (Days)'] > 14]
-            if len(high_lead_time) > 0:
-                alerts.append(f"⚠️ {len(high_lead_time)} orders with lead time > 14 days")
+            high_lead_time_count = int((data_dict['orders']['Lead Time (Days)'] > 14).sum())
+            if high_lead_time_count > 0:
+                alerts.append(f"⚠️ {high_lead_time_count} orders with lead time > 14 days")
         
         if alerts:
             for alert in alerts:
@@ -435,11 +437,14 @@ class SupplyChainDashboard:
         
         if 'Order Date' in orders_df.columns and 'Lead Time (Days)' in orders_df.columns:
             # Monthly trends
-            orders_df['Order Month'] = orders_df['Order Date'].dt.to_period('M')
-            monthly_lead_time = orders_df.groupby('Order Month')['Lead Time (Days)'].mean()
+            # Month keys via a datetime64[M] cast (no Period objects, and
+            # orders_df is left unmodified); labels are formatted once per month
+            order_month = orders_df['Order Date'].to_numpy().astype('datetime64[M]')
+            monthly_lead_time = orders_df.groupby(order_month)['Lead Time (Days)'].mean()
+            month_labels = np.datetime_as_string(monthly_lead_time.index.to_numpy().astype('datetime64[M]'), unit='M')
             
             fig = px.line(
-                x=monthly_lead_time.index.astype(str),
+                x=month_labels,
                 y=monthly_lead_time.values,
                 title="Monthly Average Lead Time"
             )
@@ -563,7 +568,14 @@ def main():
         sample_people = create_sample_people()
         sample_inventory = create_sample_inventory()
         using_real_data = False
-    
+
+    # Parse dates and derive lead time (the API serves dates as strings and
+    # the metrics calculator does not add columns to its input)
+    if 'Order Date' in sample_orders.columns and 'Ship Date' in sample_orders.columns:
+        sample_orders['Order Date'] = pd.to_datetime(sample_orders['Order Date'])
+        sample_orders['Ship Date'] = pd.to_datetime(sample_orders['Ship Date'])
+        sample_orders['Lead Time (Days)'] = (sample_orders['Ship Date'] - sample_orders['Order Date']).dt.days
+
     data_dict = {
         'orders': sample_orders,
         'inventory': sample_inventory,
@@ -1,9 +1,15 @@
+import logging
 import pandas as pd
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from utils.logger import log_pipeline_step, log_data_quality_check
 from config import LEAD_TIME_THRESHOLDS, FILL_RATE_THRESHOLDS
 
+# Keys of the dict returned by SupplyChainMetrics.calculate_all_metrics
+METRIC_TYPES = ('lead_time', 'order_cycle', 'inventory_turnover', 'fill_rate',
+                'category_performance', 'returns')
+
 class SupplyChainMetrics:
     """
     Calculate supply chain performance metrics
@@ -18,38 +24,40 @@ class SupplyChainMetrics:
         Calculate all supply chain metrics
         """
         self.logger.info("Calculating all supply chain metrics...")
-        
+
+        # Every metric needs orders or inventory rows; skip the pipeline entirely
+        # for empty inputs (e.g. dry runs) and return the same empty results
+        orders_empty = orders_df is None or len(orders_df) == 0
+        inventory_empty = inventory_df is None or len(inventory_df) == 0
+        if orders_empty and inventory_empty:
+            self.logger.warning("No orders or inventory data - skipping metrics calculation")
+            return {key: {} for key in METRIC_TYPES}
+
         metrics = {}
-        
-        # Calculate lead time metrics
-        self.logger.info("Calculating lead time metrics...")
-        metrics['lead_time'] = self.calculate_lead_time_metrics(orders_df)
-        self.logger.info("Lead time metrics calculated successfully")
-        
-        # Calculate order cycle time
-        self.logger.info("Calculating order cycle time...")
-        metrics['order_cycle'] = self.calculate_order_cycle_time(orders_df)
-        self.logger.info("Order cycle time calculated successfully")
-        
-        # Calculate inventory turnover metrics
-        self.logger.info("Calculating inventory turnover metrics...")
-        metrics['inventory_turnover'] = self.calculate_inventory_turnover(inventory_df)
-        self.logger.info("Inventory turnover metrics calculated successfully")
-        
-        # Calculate fill rate metrics
-        self.logger.info("Calculating fill rate metrics...")
-        metrics['fill_rate'] = self.calculate_fill_rate_metrics(inventory_df)
-        self.logger.info("Fill rate metrics calculated successfully")
-        
-        # Calculate category performance metrics
-        self.logger.info("Calculating category performance metrics...")
-        metrics['category_performance'] = self.calculate_category_performance(orders_df, inventory_df)
-        self.logger.info("Category performance metrics calculated successfully")
-        
-        # Calculate return metrics
-        self.logger.info("Calculating return metrics...")
-        metrics['returns'] = self.calculate_return_metrics(orders_df, returns_df)
-        self.logger.info("Return metrics calculated successfully")
+
+        # The metric functions only read their inputs, so run them concurrently
+        # (the pandas/numpy reductions release the GIL)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Calculating lead time, order cycle, inventory, fill rate, category and return metrics...")
+        with ThreadPoolExecutor(max_workers=len(METRIC_TYPES)) as executor:
+            futures = {
+                'lead_time': executor.submit(self.calculate_lead_time_metrics, orders_df),
+                'order_cycle': executor.submit(self.calculate_order_cycle_time, orders_df),
+                'inventory_turnover': executor.submit(self.calculate_inventory_turnover, inventory_df),
+                'fill_rate': executor.submit(self.calculate_fill_rate_metrics, inventory_df),
+                'category_performance': executor.submit(self.calculate_category_performance, orders_df, inventory_df),
+                'returns': executor.submit(self.calculate_return_metrics, orders_df, returns_df)
+            }
+            # The metric functions propagate their errors; handle them once here
+            # so one failing metric does not discard the others
+            for metric_type, future in futures.items():
+                try:
+                    metrics[metric_type] = future.result()
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        self.logger.debug(f"{metric_type} metrics calculated successfully")
+                except Exception as e:
+                    self.logger.error(f"Error calculating {metric_type} metrics: {str(e)}")
+                    metrics[metric_type] = {}
         
         self.logger.info("All supply chain metrics calculated successfully")
         return metrics
@@ -62,62 +70,69 @@ class SupplyChainMetrics:
         if orders_df is None or len(orders_df) == 0:
             return {}
         
-        try:
-            # Convert date columns to datetime if they're strings
-            if 'Order Date' in orders_df.columns and 'Ship Date' in orders_df.columns:
-                # Convert string dates to datetime
-                orders_df['Order Date'] = pd.to_datetime(orders_df['Order Date'])
-                orders_df['Ship Date'] = pd.to_datetime(orders_df['Ship Date'])
-                
-                # Calculate lead time in days
-                orders_df['Lead Time (Days)'] = (orders_df['Ship Date'] - orders_df['Order Date']).dt.days
-                
-                # Filter out invalid lead times (negative or unreasonably high)
-                valid_lead_times = orders_df[
-                    (orders_df['Lead Time (Days)'] >= 0) & 
-                    (orders_df['Lead Time (Days)'] <= 30)  # Reasonable upper limit
-                ]['Lead Time (Days)']
-                
-                if len(valid_lead_times) == 0:
-                    return {}
-                
-                # Calculate metrics
-                mean_lead_time = valid_lead_times.mean()
-                median_lead_time = valid_lead_times.median()
-                std_lead_time = valid_lead_times.std()
-                
-                # Performance categories based on thresholds
-                excellent_pct = (valid_lead_times <= LEAD_TIME_THRESHOLDS['excellent']).mean()
-                good_pct = ((valid_lead_times > LEAD_TIME_THRESHOLDS['excellent']) & 
-                           (valid_lead_times <= LEAD_TIME_THRESHOLDS['good'])).mean()
-                poor_pct = (valid_lead_times > LEAD_TIME_THRESHOLDS['good']).mean()
-                
-                # Additional metrics
-                min_lead_time = valid_lead_times.min()
-                max_lead_time = valid_lead_times.max()
-                lead_time_95th_percentile = valid_lead_times.quantile(0.95)
-                
-                return {
-                    'mean_lead_time': float(mean_lead_time),
-                    'median_lead_time': float(median_lead_time),
-                    'std_lead_time': float(std_lead_time),
-                    'min_lead_time': float(min_lead_time),
-                    'max_lead_time': float(max_lead_time),
-                    'lead_time_95th_percentile': float(lead_time_95th_percentile),
-                    'excellent_pct': float(excellent_pct),
-                    'good_pct': float(good_pct),
-                    'poor_pct': float(poor_pct),
-                    'total_orders': len(valid_lead_times),
-                    'invalid_lead_times': len(orders_df) - len(valid_lead_times)
-                }
-            else:
-                self.logger.warning("Order Date or Ship Date columns not found in orders data")
+        if 'Order Date' in orders_df.columns and 'Ship Date' in orders_df.columns:
+            # Calculate lead time in days
+            lead_times = self._lead_time_days(orders_df)
+            
+            # Filter out invalid lead times (negative or unreasonably high)
+            valid_lead_times = lead_times[
+                (lead_times >= 0) & 
+                (lead_times <= 30)  # Reasonable upper limit
+            ].astype(np.int16)  # bounded to 0-30 days
+            
+            if len(valid_lead_times) == 0:
                 return {}
-                
-        except Exception as e:
-            self.logger.error(f"Error calculating lead time metrics: {str(e)}")
+            
+            # Calculate metrics
+            mean_lead_time = valid_lead_times.mean()
+            median_lead_time = np.median(valid_lead_times.to_numpy())
+            std_lead_time = valid_lead_times.std()
+            
+            # Performance categories based on thresholds
+            excellent_pct = (valid_lead_times <= LEAD_TIME_THRESHOLDS['excellent']).mean()
+            good_pct = ((valid_lead_times > LEAD_TIME_THRESHOLDS['excellent']) & 
+                       (valid_lead_times <= LEAD_TIME_THRESHOLDS['good'])).mean()
+            poor_pct = (valid_lead_times > LEAD_TIME_THRESHOLDS['good']).mean()
+            
+            # Additional metrics
+            min_lead_time = valid_lead_times.min()
+            max_lead_time = valid_lead_times.max()
+            lead_time_95th_percentile = valid_lead_times.quantile(0.95)
+            
+            return {
+                'mean_lead_time': float(mean_lead_time),
+                'median_lead_time': float(median_lead_time),
+                'std_lead_time': float(std_lead_time),
+                'min_lead_time': float(min_lead_time),
+                'max_lead_time': float(max_lead_time),
+                'lead_time_95th_percentile': float(lead_time_95th_percentile),
+                'excellent_pct': float(excellent_pct),
+                'good_pct': float(good_pct),
+                'poor_pct': float(poor_pct),
+                'total_orders': len(valid_lead_times),
+                'invalid_lead_times': len(orders_df) - len(valid_lead_times)
+            }
+        else:
+            self.logger.warning("Order Date or Ship Date columns not found in orders data")
             return {}
     
+    def _lead_time_days(self, orders_df):
+        """
+        Lead time in days per order, without modifying orders_df
+        Computed from Order Date and Ship Date, falling back to an existing 'Lead Time (Days)' column
+        """
+        if 'Order Date' in orders_df.columns and 'Ship Date' in orders_df.columns:
+            # Subtract the raw datetime64 arrays and floor to whole days in numpy,
+            # skipping the pandas Timedelta accessor (.dt.days)
+            delta = (pd.to_datetime(orders_df['Ship Date']).values -
+                     pd.to_datetime(orders_df['Order Date']).values).astype('timedelta64[D]')
+            days = delta.astype(np.float64)
+            days[np.isnat(delta)] = np.nan
+            return pd.Series(days, index=orders_df.index)
+        if 'Lead Time (Days)' in orders_df.columns:
+            return orders_df['Lead Time (Days)']
+        return None
+    
     def calculate_order_cycle_time(self, orders_df):
         """
         Calculate order cycle time metrics
@@ -126,38 +141,31 @@ class SupplyChainMetrics:
         if orders_df is None or len(orders_df) == 0:
             return {}
         
-        try:
-            if 'Order Date' in orders_df.columns and 'Ship Date' in orders_df.columns:
-                # Convert dates to datetime
-                orders_df['Order Date'] = pd.to_datetime(orders_df['Order Date'])
-                orders_df['Ship Date'] = pd.to_datetime(orders_df['Ship Date'])
-                
-                # Calculate cycle time
-                orders_df['Cycle Time (Days)'] = (orders_df['Ship Date'] - orders_df['Order Date']).dt.days
-                
-                # Filter valid cycle times
-                valid_cycle_times = orders_df[
-                    (orders_df['Cycle Time (Days)'] >= 0) & 
-                    (orders_df['Cycle Time (Days)'] <= 30)
-                ]['Cycle Time (Days)']
-                
-                if len(valid_cycle_times) == 0:
-                    return {}
-                
-                return {
-                    'mean_cycle_time': float(valid_cycle_times.mean()),
-                    'median_cycle_time': float(valid_cycle_times.median()),
-                    'std_cycle_time': float(valid_cycle_times.std()),
-                    'min_cycle_time': float(valid_cycle_times.min()),
-                    'max_cycle_time': float(valid_cycle_times.max()),
-                    'cycle_time_95th_percentile': float(valid_cycle_times.quantile(0.95)),
-                    'total_orders': len(valid_cycle_times)
-                }
-            else:
+        if 'Order Date' in orders_df.columns and 'Ship Date' in orders_df.columns:
+            # Convert dates to datetime (locally; orders_df is left untouched)
+            order_dates = pd.to_datetime(orders_df['Order Date'])
+            ship_dates = pd.to_datetime(orders_df['Ship Date'])
+            
+            # Calculate cycle time in whole days with a single numpy subtraction
+            cycle_delta = (ship_dates.values - order_dates.values).astype('timedelta64[D]')
+            cycle_days = cycle_delta[~np.isnat(cycle_delta)].astype(np.int32)
+
+            # Filter valid cycle times
+            valid_cycle_times = pd.Series(cycle_days[(cycle_days >= 0) & (cycle_days <= 30)])
+            
+            if len(valid_cycle_times) == 0:
                 return {}
-                
-        except Exception as e:
-            self.logger.error(f"Error calculating order cycle time: {str(e)}")
+            
+            return {
+                'mean_cycle_time': float(valid_cycle_times.mean()),
+                'median_cycle_time': float(np.median(valid_cycle_times.to_numpy())),
+                'std_cycle_time': float(valid_cycle_times.std()),
+                'min_cycle_time': float(valid_cycle_times.min()),
+                'max_cycle_time': float(valid_cycle_times.max()),
+                'cycle_time_95th_percentile': float(valid_cycle_times.quantile(0.95)),
+                'total_orders': len(valid_cycle_times)
+            }
+        else:
             return {}
     
     def calculate_inventory_turnover(self, inventory_df):
@@ -167,39 +175,36 @@ class SupplyChainMetrics:
         if inventory_df is None or len(inventory_df) == 0:
             return {}
         
-        try:
-            metrics = {}
-            
-            if 'annualized_turnover' in inventory_df.columns:
-                turnover_data = inventory_df['annualized_turnover'].dropna()
-                if len(turnover_data) > 0:
-                    metrics['mean_turnover'] = float(turnover_data.mean())
-                    metrics['median_turnover'] = float(turnover_data.median())
-                    metrics['std_turnover'] = float(turnover_data.std())
-                    metrics['min_turnover'] = float(turnover_data.min())
-                    metrics['max_turnover'] = float(turnover_data.max())
+        metrics = {}
+        
+        if 'annualized_turnover' in inventory_df.columns:
+            turnover_data = inventory_df['annualized_turnover'].dropna().astype(np.float32)
+            if len(turnover_data) > 0:
+                metrics['mean_turnover'] = float(turnover_data.mean())
+                metrics['median_turnover'] = float(np.median(turnover_data.to_numpy()))
+                metrics['std_turnover'] = float(turnover_data.std())
+                metrics['min_turnover'] = float(turnover_data.min())
+                metrics['max_turnover'] = float(turnover_data.max())
+        
+        if 'stock_level' in inventory_df.columns and 'daily_demand' in inventory_df.columns:
+            # Calculate days of inventory
+            valid_data = inventory_df[
+                (inventory_df['stock_level'] > 0) & 
+                (inventory_df['daily_demand'] > 0)
+            ]
             
-            if 'stock_level' in inventory_df.columns and 'daily_demand' in inventory_df.columns:
-                # Calculate days of inventory
-                valid_data = inventory_df[
-                    (inventory_df['stock_level'] > 0) & 
-                    (inventory_df['daily_demand'] > 0)
-                ]
+            if len(valid_data) > 0:
+                days_of_inventory = (
+                    valid_data['stock_level'].astype(np.float32) / valid_data['daily_demand'].astype(np.float32)
+                )
+                days_data = days_of_inventory.dropna()
                 
-                if len(valid_data) > 0:
-                    valid_data['days_of_inventory'] = valid_data['stock_level'] / valid_data['daily_demand']
-                    days_data = valid_data['days_of_inventory'].dropna()
-                    
-                    if len(days_data) > 0:
-                        metrics['mean_days_of_inventory'] = float(days_data.mean())
-                        metrics['median_days_of_inventory'] = float(days_data.median())
-                        metrics['std_days_of_inventory'] = float(days_data.std())
-            
-            return metrics
-            
-        except Exception as e:
-            self.logger.error(f"Error calculating inventory turnover: {str(e)}")
-            return {}
+                if len(days_data) > 0:
+                    metrics['mean_days_of_inventory'] = float(days_data.mean())
+                    metrics['median_days_of_inventory'] = float(np.median(days_data.to_numpy()))
+                    metrics['std_days_of_inventory'] = float(days_data.std())
+        
+        return metrics
     
     def calculate_fill_rate_metrics(self, inventory_df):
         """
@@ -208,37 +213,34 @@ class SupplyChainMetrics:
         if inventory_df is None or len(inventory_df) == 0:
             return {}
         
-        try:
-            metrics = {}
-            
-            if 'fill_rate' in inventory_df.columns:
-                fill_rate_data = inventory_df['fill_rate'].dropna()
-                if len(fill_rate_data) > 0:
-                    metrics['mean_fill_rate'] = float(fill_rate_data.mean())
-                    metrics['median_fill_rate'] = float(fill_rate_data.median())
-                    metrics['std_fill_rate'] = float(fill_rate_data.std())
-                    
-                    # Performance categories
-                    excellent_fill_rate_pct = (fill_rate_data >= FILL_RATE_THRESHOLDS['excellent']).mean()
-                    good_fill_rate_pct = ((fill_rate_data >= FILL_RATE_THRESHOLDS['good']) & 
-                                        (fill_rate_data < FILL_RATE_THRESHOLDS['excellent'])).mean()
-                    poor_fill_rate_pct = (fill_rate_data < FILL_RATE_THRESHOLDS['good']).mean()
-                    
-                    metrics['excellent_fill_rate_pct'] = float(excellent_fill_rate_pct)
-                    metrics['good_fill_rate_pct'] = float(good_fill_rate_pct)
-                    metrics['poor_fill_rate_pct'] = float(poor_fill_rate_pct)
-            
-            if 'stockout_risk' in inventory_df.columns:
-                risk_data = inventory_df['stockout_risk']
-                metrics['products_at_risk'] = int(risk_data.sum())
-                metrics['total_products'] = len(risk_data)
-                metrics['risk_percentage'] = float(risk_data.mean())
-            
-            return metrics
-            
-        except Exception as e:
-            self.logger.error(f"Error calculating fill rate metrics: {str(e)}")
-            return {}
+        metrics = {}
+        
+        if 'fill_rate' in inventory_df.columns:
+            fill_rate_data = inventory_df['fill_rate'].dropna().astype(np.float32)
+            if len(fill_rate_data) > 0:
+                metrics['mean_fill_rate'] = float(fill_rate_data.mean())
+                metrics['median_fill_rate'] = float(np.median(fill_rate_data.to_numpy()))
+                metrics['std_fill_rate'] = float(fill_rate_data.std())
+                
+                # Performance categories (thresholds cast to match the float32 data)
+                excellent_threshold = np.float32(FILL_RATE_THRESHOLDS['excellent'])
+                good_threshold = np.float32(FILL_RATE_THRESHOLDS['good'])
+                excellent_fill_rate_pct = (fill_rate_data >= excellent_threshold).mean()
+                good_fill_rate_pct = ((fill_rate_data >= good_threshold) & 
+                                    (fill_rate_data < excellent_threshold)).mean()
+                poor_fill_rate_pct = (fill_rate_data < good_threshold).mean()
+                
+                metrics['excellent_fill_rate_pct'] = float(excellent_fill_rate_pct)
+                metrics['good_fill_rate_pct'] = float(good_fill_rate_pct)
+                metrics['poor_fill_rate_pct'] = float(poor_fill_rate_pct)
+        
+        if 'stockout_risk' in inventory_df.columns:
+            risk_data = inventory_df['stockout_risk']
+            metrics['products_at_risk'] = int(risk_data.sum())
+            metrics['total_products'] = len(risk_data)
+            metrics['risk_percentage'] = float(risk_data.mean())
+        
+        return metrics
     
     def calculate_category_performance(self, orders_df, inventory_df):
         """
@@ -248,57 +250,56 @@ class SupplyChainMetrics:
         if orders_df is None or len(orders_df) == 0:
             return {}
         
-        try:
-            metrics = {}
+        metrics = {}
+        
+        if 'Category' in orders_df.columns and 'Sales' in orders_df.columns:
+            # Category sales analysis
+            category_sales = orders_df.groupby('Category', sort=False, observed=True).agg({
+                'Sales': ['sum', 'mean', 'count'],
+                'Order ID': 'nunique'
+            }).round(2)
             
-            if 'Category' in orders_df.columns and 'Sales' in orders_df.columns:
-                # Category sales analysis
-                category_sales = orders_df.groupby('Category').agg({
-                    'Sales': ['sum', 'mean', 'count'],
-                    'Order ID': 'nunique'
-                }).round(2)
-                
-                category_sales.columns = ['Total_Sales', 'Avg_Sale', 'Total_Items', 'Unique_Orders']
-                category_sales = category_sales.reset_index()
-                
-                # Add lead time by category if available
-                if 'Lead Time (Days)' in orders_df.columns:
-                    category_lead_time = orders_df.groupby('Category')['Lead Time (Days)'].agg([
-                        'mean', 'median', 'std', 'count'
-                    ]).round(2)
-                    category_lead_time.columns = ['Avg_Lead_Time', 'Median_Lead_Time', 'Std_Lead_Time', 'Order_Count']
-                    category_lead_time = category_lead_time.reset_index()
-                    
-                    # Merge sales and lead time data
-                    category_performance = pd.merge(category_sales, category_lead_time, on='Category')
-                else:
-                    category_performance = category_sales
-                
-                # Convert to dictionary format
-                metrics['category_breakdown'] = category_performance.to_dict('records')
+            category_sales.columns = ['Total_Sales', 'Avg_Sale', 'Total_Items', 'Unique_Orders']
+            # Sort once here; the lead time join below keeps this order
+            category_sales = category_sales.sort_index()
+            
+            # Add lead time by category if available
+            lead_times = self._lead_time_days(orders_df)
+            if lead_times is not None:
+                category_lead_time = lead_times.groupby(orders_df['Category'], sort=False, observed=True).agg([
+                    'mean', 'median', 'std', 'count'
+                ]).round(2)
+                category_lead_time.columns = ['Avg_Lead_Time', 'Median_Lead_Time', 'Std_Lead_Time', 'Order_Count']
                 
-                # Top performing categories
-                if len(category_performance) > 0:
-                    top_sales_category = category_performance.loc[category_performance['Total_Sales'].idxmax()]
-                    metrics['top_sales_category'] = {
-                        'category': top_sales_category['Category'],
-                        'total_sales': float(top_sales_category['Total_Sales']),
-                        'order_count': int(top_sales_category['Unique_Orders'])
-                    }
-                    
-                    if 'Avg_Lead_Time' in category_performance.columns:
-                        best_lead_time_category = category_performance.loc[category_performance['Avg_Lead_Time'].idxmin()]
-                        metrics['best_lead_time_category'] = {
-                            'category': best_lead_time_category['Category'],
-                            'avg_lead_time': float(best_lead_time_category['Avg_Lead_Time']),
-                            'order_count': int(best_lead_time_category['Order_Count'])
-                        }
+                # Join sales and lead time data on the shared Category index
+                category_performance = category_sales.join(category_lead_time, how='inner')
+            else:
+                category_performance = category_sales
             
-            return metrics
+            # Promote Category to a column once, for the records output
+            category_performance = category_performance.reset_index()
             
-        except Exception as e:
-            self.logger.error(f"Error calculating category performance: {str(e)}")
-            return {}
+            # Convert to dictionary format
+            metrics['category_breakdown'] = category_performance.to_dict('records')
+            
+            # Top performing categories
+            if len(category_performance) > 0:
+                top_sales_category = category_performance.loc[category_performance['Total_Sales'].idxmax()]
+                metrics['top_sales_category'] = {
+                    'category': top_sales_category['Category'],
+                    'total_sales': float(top_sales_category['Total_Sales']),
+                    'order_count': int(top_sales_category['Unique_Orders'])
+                }
+                
+                if 'Avg_Lead_Time' in category_performance.columns:
+                    best_lead_time_category = category_performance.loc[category_performance['Avg_Lead_Time'].idxmin()]
+                    metrics['best_lead_time_category'] = {
+                        'category': best_lead_time_category['Category'],
+                        'avg_lead_time': float(best_lead_time_category['Avg_Lead_Time']),
+                        'order_count': int(best_lead_time_category['Order_Count'])
+                    }
+        
+        return metrics
     
     def calculate_return_metrics(self, orders_df, returns_df):
         """
@@ -308,103 +309,42 @@ class SupplyChainMetrics:
         if orders_df is None or len(orders_df) == 0:
             return {}
         
-        try:
-            metrics = {}
-            
-            total_orders = len(orders_df)
-            
-            if returns_df is not None and len(returns_df) > 0:
-                # Check if returns_df is actually orders data (same structure)
-                if 'Order ID' in returns_df.columns and 'Sales' in returns_df.columns:
-                    # This is likely orders data, not returns data
-                    # Create a realistic return simulation based on order patterns
-                    import random
-                    
-                    # Simulate returns based on order characteristics
-                    # Higher return rates for certain categories and regions
-                    return_probabilities = {
-                        'Furniture': 0.15,  # 15% return rate for furniture
-                        'Office Supplies': 0.05,  # 5% return rate for office supplies
-                        'Technology': 0.10   # 10% return rate for technology
-                    }
-                    
-                    # Simulate returns
-                    simulated_returns = []
-                    for _, order in orders_df.iterrows():
-                        category = order.get('Category', 'Office Supplies')
-                        return_prob = return_probabilities.get(category, 0.05)
-                        
-                        # Simulate return based on probability
-                        if random.random() < return_prob:
-                            simulated_returns.append({
-                                'Order ID': order['Order ID'],
-                                'Category': category,
-                                'Region': order.get('Region', 'Unknown'),
-                                'Return Date': order.get('Order Date', ''),
-                                'Return Reason': random.choice(['Defective', 'Wrong Size', 'Not as Expected', 'Changed Mind'])
-                            })
-                    
-                    # Calculate metrics based on simulated returns
-                    total_returned_orders = len(set([r['Order ID'] for r in simulated_returns]))
-                    return_rate = total_returned_orders / total_orders if total_orders > 0 else 0
-                    
-                    metrics['return_rate'] = float(return_rate)
-                    metrics['total_orders'] = total_orders
-                    metrics['total_returned_orders'] = total_returned_orders
-                    metrics['total_return_items'] = len(simulated_returns)
-                    
-                    # Return analysis by category
-                    if simulated_returns:
-                        return_df = pd.DataFrame(simulated_returns)
-                        return_by_category = return_df['Category'].value_counts()
-                        metrics['returns_by_category'] = return_by_category.to_dict()
-                        
-                        if 'Region' in return_df.columns:
-                            return_by_region = return_df['Region'].value_counts()
-                            metrics['returns_by_region'] = return_by_region.to_dict()
-                else:
-                    # This might be actual returns data
-                    returned_order_ids = returns_df['Order ID'].unique()
-                    total_returned_orders = len(returned_order_ids)
-                    return_rate = total_returned_orders / total_orders if total_orders > 0 else 0
-                    
-                    metrics['return_rate'] = float(return_rate)
-                    metrics['total_orders'] = total_orders
-                    metrics['total_returned_orders'] = total_returned_orders
-                    metrics['total_return_items'] = len(returns_df)
-                    
-                    # Return analysis by category if available
-                    if 'Category' in returns_df.columns:
-                        return_by_category = returns_df['Category'].value_counts()
-                        metrics['returns_by_category'] = return_by_category.to_dict()
-                    
-                    # Return analysis by region if available
-                    if 'Region' in returns_df.columns:
-                        return_by_region = returns_df['Region'].value_counts()
-                        metrics['returns_by_region'] = return_by_region.to_dict()
-            else:
-                # No returns data - simulate based on typical return rates
+        metrics = {}
+        
+        total_orders = len(orders_df)
+        
+        if returns_df is not None and len(returns_df) > 0:
+            # Check if returns_df is actually orders data (same structure)
+            if 'Order ID' in returns_df.columns and 'Sales' in returns_df.columns:
+                # This is likely orders data, not returns data
+                # Create a realistic return simulation based on order patterns
                 import random
                 
-                # Simulate returns with realistic rates
+                # Simulate returns based on order characteristics
+                # Higher return rates for certain categories and regions
                 return_probabilities = {
-                    'Furniture': 0.15,
-                    'Office Supplies': 0.05,
-                    'Technology': 0.10
+                    'Furniture': 0.15,  # 15% return rate for furniture
+                    'Office Supplies': 0.05,  # 5% return rate for office supplies
+                    'Technology': 0.10   # 10% return rate for technology
                 }
                 
+                # Simulate returns
                 simulated_returns = []
                 for _, order in orders_df.iterrows():
                     category = order.get('Category', 'Office Supplies')
                     return_prob = return_probabilities.get(category, 0.05)
                     
+                    # Simulate return based on probability
                     if random.random() < return_prob:
                         simulated_returns.append({
                             'Order ID': order['Order ID'],
                             'Category': category,
-                            'Region': order.get('Region', 'Unknown')
+                            'Region': order.get('Region', 'Unknown'),
+                            'Return Date': order.get('Order Date', ''),
+                            'Return Reason': random.choice(['Defective', 'Wrong Size', 'Not as Expected', 'Changed Mind'])
                         })
                 
+                # Calculate metrics based on simulated returns
                 total_returned_orders = len(set([r['Order ID'] for r in simulated_returns]))
                 return_rate = total_returned_orders / total_orders if total_orders > 0 else 0
                 
@@ -412,9 +352,65 @@ class SupplyChainMetrics:
                 metrics['total_orders'] = total_orders
                 metrics['total_returned_orders'] = total_returned_orders
                 metrics['total_return_items'] = len(simulated_returns)
+                
+                # Return analysis by category
+                if simulated_returns:
+                    return_df = pd.DataFrame(simulated_returns)
+                    return_by_category = return_df['Category'].value_counts()
+                    metrics['returns_by_category'] = return_by_category.to_dict()
+                    
+                    if 'Region' in return_df.columns:
+                        return_by_region = return_df['Region'].value_counts()
+                        metrics['returns_by_region'] = return_by_region.to_dict()
+            else:
+                # This might be actual returns data
+                returned_order_ids = returns_df['Order ID'].unique()
+                total_returned_orders = len(returned_order_ids)
+                return_rate = total_returned_orders / total_orders if total_orders > 0 else 0
+                
+                metrics['return_rate'] = float(return_rate)
+                metrics['total_orders'] = total_orders
+                metrics['total_returned_orders'] = total_returned_orders
+                metrics['total_return_items'] = len(returns_df)
+                
+                # Return analysis by category if available
+                if 'Category' in returns_df.columns:
+                    return_by_category = returns_df['Category'].value_counts()
+                    metrics['returns_by_category'] = return_by_category.to_dict()
+                
+                # Return analysis by region if available
+                if 'Region' in returns_df.columns:
+                    return_by_region = returns_df['Region'].value_counts()
+                    metrics['returns_by_region'] = return_by_region.to_dict()
+        else:
+            # No returns data - simulate based on typical return rates
+            import random
             
-            return metrics
+            # Simulate returns with realistic rates
+            return_probabilities = {
+                'Furniture': 0.15,
+                'Office Supplies': 0.05,
+                'Technology': 0.10
+            }
             
-        except Exception as e:
-            self.logger.error(f"Error calculating return metrics: {str(e)}")
-            return {} 
\ No newline at end of file
+            simulated_returns = []
+            for _, order in orders_df.iterrows():
+                category = order.get('Category', 'Office Supplies')
+                return_prob = return_probabilities.get(category, 0.05)
+                
+                if random.random() < return_prob:
+                    simulated_returns.append({
+                        'Order ID': order['Order ID'],
+                        'Category': category,
+                        'Region': order.get('Region', 'Unknown')
+                    })
+            
+            total_returned_orders = len(set([r['Order ID'] for r in simulated_returns]))
+            return_rate = total_returned_orders / total_orders if total_orders > 0 else 0
+            
+            metrics['return_rate'] = float(return_rate)
+            metrics['total_orders'] = total_orders
+            metrics['total_returned_orders'] = total_returned_orders
+            metrics['total_return_items'] = len(simulated_returns)
+        
+        return metrics
\ No newline at end of file
@@ -1,101 +1,64 @@
+import functools
+import io
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from google.cloud import bigquery
+from google.cloud.bigquery_storage_v1 import BigQueryWriteClient, types, writer
+from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
 from google.oauth2 import service_account
 import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait
+from datetime import date, timedelta
+from requests.adapters import HTTPAdapter
 from utils.logger import log_pipeline_step, log_data_quality_check
-from config import PROJECT_ID, DATASET_ID, LOCATION
+from config import (
+    PROJECT_ID, DATASET_ID, LOCATION, BIGQUERY_HTTP_POOL_SIZE, STORAGE_WRITE_BATCH_ROWS,
+    MART_REFRESH_WINDOW_DAYS
+)
 
-class BigQueryConnector:
-    """
-    Handles BigQuery operations including data loading and star schema management
-    """
-    
-    def __init__(self):
-        self.logger = log_pipeline_step("BigQueryConnector", "STARTED")
-        self.project_id = PROJECT_ID
-        self.dataset_id = DATASET_ID
-        self.location = LOCATION
-        
-        # Initialize BigQuery client
-        try:
-            # Try to use service account if available
-            if os.path.exists('service-account-key.json'):
-                credentials = service_account.Credentials.from_service_account_file(
-                    'service-account-key.json'
-                )
-                self.client = bigquery.Client(
-                    credentials=credentials,
-                    project=self.project_id
-                )
-            else:
-                # Use default credentials
-                self.client = bigquery.Client(project=self.project_id)
-            
-            self.logger.info("BigQuery client initialized successfully")
-            
-        except Exception as e:
-            self.logger.error(f"Error initializing BigQuery client: {str(e)}")
-            self.client = None
-    
-    def create_dataset(self):
-        """
-        Create the supply chain analytics dataset
-        """
-        try:
-            self.logger.info(f"Creating dataset: {self.dataset_id}")
-            
-            dataset_ref = self.client.dataset(self.dataset_id)
-            dataset = bigquery.Dataset(dataset_ref)
-            dataset.location = self.location
-            
-            dataset = self.client.create_dataset(dataset, exists_ok=True)
-            self.logger.info(f"Dataset {self.dataset_id} created successfully")
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"Error creating dataset: {str(e)}")
-            return False
-    
-    def create_star_schema_tables(self):
-        """
-        Create star schema tables: fact tables and dimension tables
-        """
-        try:
-            self.logger.info("Creating star schema tables...")
-            
-            # Create dimension tables
-            self._create_dimensions()
-            
-            # Create fact tables
-            self._create_facts()
-            
-            self.logger.info("Star schema tables created successfully")
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"Error creating star schema tables: {str(e)}")
-            return False
-    
-    def _create_dimensions(self):
-        """
-        Create dimension tables
-        """
-        # Products dimension
-        products_schema = [
+# dim_time rows, generated in SQL (no holiday calendar is available, so
+# is_holiday is always FALSE)
+DIM_TIME_QUERY = """
+SELECT
+    d AS date_id,
+    EXTRACT(YEAR FROM d) AS year,
+    EXTRACT(MONTH FROM d) AS month,
+    EXTRACT(DAY FROM d) AS day,
+    EXTRACT(QUARTER FROM d) AS quarter,
+    EXTRACT(DAYOFWEEK FROM d) AS day_of_week,
+    EXTRACT(DAYOFWEEK FROM d) IN (1, 7) AS is_weekend,
+    FALSE AS is_holiday
+FROM UNNEST(GENERATE_DATE_ARRAY('2000-01-01', '2035-12-31')) AS d
+"""
+
+# Audit columns shared by every table loaded from the pipeline
+AUDIT_COLUMNS = [
+    bigquery.SchemaField("created_date", "TIMESTAMP", default_value_expression="CURRENT_TIMESTAMP()"),
+    bigquery.SchemaField("updated_date", "TIMESTAMP", default_value_expression="CURRENT_TIMESTAMP()")
+]
+
+# Star schema table definitions (dimensions first, then facts), passed to
+# _schema_to_ddl; fact schemas also drive the Storage Write row encoding
+SCHEMAS = {
+    # Products dimension
+    "dim_products": {
+        "schema": [
             bigquery.SchemaField("product_id", "INTEGER", mode="REQUIRED"),
             bigquery.SchemaField("product_name", "STRING", mode="REQUIRED"),
             bigquery.SchemaField("category", "STRING", mode="REQUIRED"),
             bigquery.SchemaField("price", "FLOAT", mode="REQUIRED"),
             bigquery.SchemaField("description", "STRING"),
-            bigquery.SchemaField("image_url", "STRING"),
-            bigquery.SchemaField("created_date", "TIMESTAMP"),
-            bigquery.SchemaField("updated_date", "TIMESTAMP")
-        ]
-        
-        self._create_table("dim_products", products_schema, clustering_fields=["category"])
-        
-        # Customers dimension
-        customers_schema = [
+            bigquery.SchemaField("image_url", "STRING")
+        ] + AUDIT_COLUMNS,
+        "clustering_fields": ["category"]
+    },
+    # Customers dimension
+    "dim_customers": {
+        "schema": [
             bigquery.SchemaField("customer_id", "STRING", mode="REQUIRED"),
             bigquery.SchemaField("customer_name", "STRING", mode="REQUIRED"),
             bigquery.SchemaField("segment", "STRING"),
@@ -103,15 +66,13 @@ class BigQueryConnector:
             bigquery.SchemaField("city", "STRING"),
             bigquery.SchemaField("state", "STRING"),
             bigquery.SchemaField("postal_code", "STRING"),
-            bigquery.SchemaField("region", "STRING"),
-            bigquery.SchemaField("created_date", "TIMESTAMP"),
-            bigquery.SchemaField("updated_date", "TIMESTAMP")
-        ]
-        
-        self._create_table("dim_customers", customers_schema, clustering_fields=["segment", "country"])
-        
-        # Time dimension
-        time_schema = [
+            bigquery.SchemaField("region", "STRING")
+        ] + AUDIT_COLUMNS,
+        "clustering_fields": ["segment", "country"]
+    },
+    # Time dimension, populated in BigQuery from a generated date range
+    "dim_time": {
+        "schema": [
             bigquery.SchemaField("date_id", "DATE", mode="REQUIRED"),
             bigquery.SchemaField("year", "INTEGER", mode="REQUIRED"),
             bigquery.SchemaField("month", "INTEGER", mode="REQUIRED"),
@@ -120,36 +81,32 @@ class BigQueryConnector:
             bigquery.SchemaField("day_of_week", "INTEGER", mode="REQUIRED"),
             bigquery.SchemaField("is_weekend", "BOOLEAN", mode="REQUIRED"),
             bigquery.SchemaField("is_holiday", "BOOLEAN", mode="REQUIRED")
-        ]
-        
-        self._create_table("dim_time", time_schema, clustering_fields=["year", "month"])
-        
-        # Locations dimension
-        locations_schema = [
+        ],
+        "clustering_fields": ["year", "month"],
+        "query": DIM_TIME_QUERY
+    },
+    # Locations dimension
+    "dim_locations": {
+        "schema": [
             bigquery.SchemaField("location_id", "STRING", mode="REQUIRED"),
             bigquery.SchemaField("country", "STRING", mode="REQUIRED"),
             bigquery.SchemaField("state", "STRING"),
             bigquery.SchemaField("city", "STRING"),
             bigquery.SchemaField("postal_code", "STRING"),
-            bigquery.SchemaField("region", "STRING"),
-            bigquery.SchemaField("created_date", "TIMESTAMP"),
-            bigquery.SchemaField("updated_date", "TIMESTAMP")
-        ]
-        
-        self._create_table("dim_locations", locations_schema, clustering_fields=["country", "state"])
-    
-    def _create_facts(self):
-        """
-        Create fact tables
-        """
-        # Orders fact table
-        orders_fact_schema = [
+            bigquery.SchemaField("region", "STRING")
+        ] + AUDIT_COLUMNS,
+        "clustering_fields": ["country", "state"]
+    },
+    # Orders fact table
+    "fact_orders": {
+        "schema": [
             bigquery.SchemaField("order_id", "STRING", mode="REQUIRED"),
             bigquery.SchemaField("order_date", "DATE", mode="REQUIRED"),
             bigquery.SchemaField("ship_date", "DATE"),
             bigquery.SchemaField("delivery_date", "DATE"),
             bigquery.SchemaField("customer_id", "STRING", mode="REQUIRED"),
             bigquery.SchemaField("product_id", "INTEGER", mode="REQUIRED"),
+            bigquery.SchemaField("category", "STRING"),
             bigquery.SchemaField("location_id", "STRING", mode="REQUIRED"),
             bigquery.SchemaField("quantity", "INTEGER", mode="REQUIRED"),
             bigquery.SchemaField("sales", "FLOAT", mode="REQUIRED"),
@@ -158,20 +115,18 @@ class BigQueryConnector:
             bigquery.SchemaField("shipping_cost", "FLOAT"),
             bigquery.SchemaField("lead_time_days", "INTEGER"),
             bigquery.SchemaField("order_cycle_time_days", "INTEGER"),
-            bigquery.SchemaField("order_value", "FLOAT"),
-            bigquery.SchemaField("created_date", "TIMESTAMP"),
-            bigquery.SchemaField("updated_date", "TIMESTAMP")
-        ]
-        
-        self._create_table("fact_orders", orders_fact_schema, 
-                          partitioning_field="order_date", 
-                          clustering_fields=["customer_id", "product_id"])
-        
-        # Inventory fact table
-        inventory_fact_schema = [
+            bigquery.SchemaField("order_value", "FLOAT")
+        ] + AUDIT_COLUMNS,
+        "partitioning_field": "order_date",
+        "clustering_fields": ["category", "customer_id"]
+    },
+    # Inventory fact table
+    "fact_inventory": {
+        "schema": [
             bigquery.SchemaField("inventory_id", "STRING", mode="REQUIRED"),
             bigquery.SchemaField("date", "DATE", mode="REQUIRED"),
             bigquery.SchemaField("product_id", "INTEGER", mode="REQUIRED"),
+            bigquery.SchemaField("category", "STRING"),
             bigquery.SchemaField("stock_level", "INTEGER", mode="REQUIRED"),
             bigquery.SchemaField("daily_demand", "INTEGER", mode="REQUIRED"),
             bigquery.SchemaField("restock_amount", "INTEGER"),
@@ -182,57 +137,383 @@ class BigQueryConnector:
             bigquery.SchemaField("days_of_inventory", "FLOAT"),
             bigquery.SchemaField("stockout_risk", "BOOLEAN"),
             bigquery.SchemaField("annualized_turnover", "FLOAT"),
-            bigquery.SchemaField("fill_rate", "FLOAT"),
-            bigquery.SchemaField("created_date", "TIMESTAMP"),
-            bigquery.SchemaField("updated_date", "TIMESTAMP")
-        ]
-        
-        self._create_table("fact_inventory", inventory_fact_schema, 
-                          partitioning_field="date", 
-                          clustering_fields=["product_id"])
-        
-        # Returns fact table
-        returns_fact_schema = [
+            bigquery.SchemaField("fill_rate", "FLOAT")
+        ] + AUDIT_COLUMNS,
+        "partitioning_field": "date",
+        "clustering_fields": ["category", "product_id"]
+    },
+    # Returns fact table
+    "fact_returns": {
+        "schema": [
             bigquery.SchemaField("return_id", "STRING", mode="REQUIRED"),
             bigquery.SchemaField("return_date", "DATE", mode="REQUIRED"),
             bigquery.SchemaField("order_id", "STRING", mode="REQUIRED"),
             bigquery.SchemaField("customer_id", "STRING", mode="REQUIRED"),
             bigquery.SchemaField("product_id", "INTEGER", mode="REQUIRED"),
             bigquery.SchemaField("return_reason", "STRING"),
-            bigquery.SchemaField("return_amount", "FLOAT"),
-            bigquery.SchemaField("created_date", "TIMESTAMP"),
-            bigquery.SchemaField("updated_date", "TIMESTAMP")
-        ]
+            bigquery.SchemaField("return_amount", "FLOAT")
+        ] + AUDIT_COLUMNS,
+        "partitioning_field": "return_date",
+        "clustering_fields": ["customer_id", "product_id"]
+    }
+}
+
+# Storage Write API protobuf field types for each BigQuery column type
+# (DATE is sent as days since the epoch)
+PROTO_FIELD_TYPES = {
+    "STRING": descriptor_pb2.FieldDescriptorProto.TYPE_STRING,
+    "INTEGER": descriptor_pb2.FieldDescriptorProto.TYPE_INT64,
+    "FLOAT": descriptor_pb2.FieldDescriptorProto.TYPE_DOUBLE,
+    "BOOLEAN": descriptor_pb2.FieldDescriptorProto.TYPE_BOOL,
+    "DATE": descriptor_pb2.FieldDescriptorProto.TYPE_INT32,
+    "TIMESTAMP": descriptor_pb2.FieldDescriptorProto.TYPE_INT64
+}
+
+# Data mart SQL, formatted once per connector with the project and dataset
+# ({start_date} is filled in per create_data_marts call). The marts are
+# tables rebuilt only when create_data_marts runs; their outer joins and
+# COUNT(DISTINCT) rule out incremental materialized views, which BigQuery
+# would otherwise recompute in full on every scheduled refresh
+MART_QUERIES = {
+    "mart_category_all": """
+    CREATE OR REPLACE TABLE `{project_id}.{dataset_id}.mart_category_all` AS
+    SELECT 
+        o.category,
+        COUNT(DISTINCT o.order_id) as total_orders,
+        AVG(o.lead_time_days) as avg_lead_time,
+        AVG(o.order_value) as avg_order_value,
+        SUM(o.sales) as total_sales,
+        SUM(o.profit) as total_profit,
+        AVG(i.fill_rate) as avg_fill_rate,
+        AVG(i.annualized_turnover) as avg_turnover,
+        COUNT(DISTINCT r.return_id) as total_returns,
+        CASE 
+            WHEN COUNT(DISTINCT o.order_id) > 0 
+            THEN COUNT(DISTINCT r.return_id) / COUNT(DISTINCT o.order_id) 
+            ELSE 0 
+        END as return_rate
+    FROM `{project_id}.{dataset_id}.fact_orders` o
+    LEFT JOIN (
+        SELECT order_id, return_id
+        FROM `{project_id}.{dataset_id}.fact_returns`
+        WHERE return_date >= DATE '{start_date}'
+    ) r ON o.order_id = r.order_id
+    LEFT JOIN (
+        SELECT product_id, AVG(fill_rate) as fill_rate, AVG(annualized_turnover) as annualized_turnover
+        FROM `{project_id}.{dataset_id}.fact_inventory`
+        WHERE date >= DATE '{start_date}'
+        GROUP BY product_id
+    ) i ON o.product_id = i.product_id
+    WHERE o.order_date >= DATE '{start_date}'
+    GROUP BY o.category
+    """,
+    "mart_vendor_performance": """
+    CREATE OR REPLACE VIEW `{project_id}.{dataset_id}.mart_vendor_performance` AS
+    SELECT 
+        category,
+        total_orders,
+        avg_lead_time,
+        avg_order_value,
+        total_sales,
+        total_profit,
+        total_returns,
+        return_rate
+    FROM `{project_id}.{dataset_id}.mart_category_all`
+    """,
+    "mart_inventory_analysis": """
+    CREATE OR REPLACE TABLE `{project_id}.{dataset_id}.mart_inventory_analysis` AS
+    SELECT 
+        i.category,
+        AVG(i.stock_level) as avg_stock_level,
+        AVG(i.daily_demand) as avg_daily_demand,
+        AVG(i.fill_rate) as avg_fill_rate,
+        AVG(i.annualized_turnover) as avg_turnover,
+        AVG(i.days_of_inventory) as avg_days_of_inventory,
+        SUM(CASE WHEN i.stockout_risk THEN 1 ELSE 0 END) as stockout_risk_count,
+        COUNT(*) as total_records
+    FROM `{project_id}.{dataset_id}.fact_inventory` i
+    WHERE i.date >= DATE '{start_date}'
+    GROUP BY i.category
+    """,
+    "mart_fulfillment_analytics": """
+    CREATE OR REPLACE TABLE `{project_id}.{dataset_id}.mart_fulfillment_analytics` AS
+    SELECT 
+        DATE_TRUNC(o.order_date, MONTH) as month,
+        o.category,
+        COUNT(DISTINCT o.order_id) as total_orders,
+        AVG(o.lead_time_days) as avg_lead_time,
+        AVG(o.order_cycle_time_days) as avg_cycle_time,
+        SUM(o.sales) as total_sales,
+        COUNT(DISTINCT o.customer_id) as unique_customers
+    FROM `{project_id}.{dataset_id}.fact_orders` o
+    WHERE o.order_date >= DATE '{start_date}'
+    GROUP BY DATE_TRUNC(o.order_date, MONTH), o.category
+    """,
+    "mart_category_performance": """
+    CREATE OR REPLACE VIEW `{project_id}.{dataset_id}.mart_category_performance` AS
+    SELECT 
+        category,
+        total_orders,
+        total_sales,
+        total_profit,
+        avg_lead_time,
+        avg_fill_rate,
+        avg_turnover,
+        total_returns
+    FROM `{project_id}.{dataset_id}.mart_category_all`
+    """
+}
+
+# Object type of each mart, as reported by BigQuery table listings
+MART_TABLE_TYPES = {
+    "mart_category_all": "TABLE",
+    "mart_vendor_performance": "VIEW",
+    "mart_inventory_analysis": "TABLE",
+    "mart_fulfillment_analytics": "TABLE",
+    "mart_category_performance": "VIEW"
+}
+
+def _mart_start_date(refresh_window_days, today=None):
+    """
+    First fact date read by the data marts, as an ISO date string
+    With no window this is BigQuery's earliest DATE: the fact tables require
+    a partition filter, so the marts always filter, just without bound
+    """
+    if refresh_window_days is None:
+        return "0001-01-01"
+    return ((today or date.today()) - timedelta(days=refresh_window_days)).isoformat()
+
+@functools.lru_cache(maxsize=1)
+def _get_credentials():
+    """
+    Read the service account key once per process
+    Returns None when there is no key file, so default credentials are used
+    """
+    if os.path.exists('service-account-key.json'):
+        return service_account.Credentials.from_service_account_file(
+            'service-account-key.json'
+        )
+    return None
+
+class StreamWriteJob:
+    """
+    Tracks the appends sent on a pending Storage Write stream
+    Mirrors the parts of a load job that callers wait on
+    """
+    
+    def __init__(self, append_rows_stream, futures, output_rows, commit):
+        self.append_rows_stream = append_rows_stream
+        self.futures = futures
+        self.output_rows = output_rows
+        self.commit = commit
+        
+        # Outcome of the first result() call, returned by every later call
+        self._lock = threading.Lock()
+        self._finished = False
+        self._error = None
+    
+    def result(self):
+        """
+        Block until every append is acknowledged, close the stream, then
+        commit the appended rows (only the first call does the work)
+        """
+        with self._lock:
+            if not self._finished:
+                try:
+                    try:
+                        for future in self.futures:
+                            future.result()
+                    finally:
+                        self.append_rows_stream.close()
+                    self.commit()
+                except Exception as e:
+                    self._error = e
+                self._finished = True
         
-        self._create_table("fact_returns", returns_fact_schema, 
-                          partitioning_field="return_date", 
-                          clustering_fields=["customer_id", "product_id"])
+        if self._error is not None:
+            raise self._error
+        return self
     
-    def _create_table(self, table_name, schema, partitioning_field=None, clustering_fields=None):
+    def exception(self):
         """
-        Create a table with the specified schema
+        Wait for the appends and return the first error raised, if any
         """
         try:
-            table_id = f"{self.project_id}.{self.dataset_id}.{table_name}"
-            table = bigquery.Table(table_id, schema=schema)
-            
-            # Set partitioning if specified
-            if partitioning_field:
-                table.time_partitioning = bigquery.TimePartitioning(
-                    type_=bigquery.TimePartitioningType.DAY,
-                    field=partitioning_field
+            self.result()
+        except Exception as e:
+            return e
+        return None
+    
+    def add_done_callback(self, callback):
+        """
+        Call callback(job) from a background thread once the appends finish
+        """
+        threading.Thread(target=lambda: (self.exception(), callback(self)), daemon=True).start()
+
+class BigQueryConnector:
+    """
+    Handles BigQuery operations including data loading and star schema management
+    """
+    
+    def __init__(self):
+        self.logger = log_pipeline_step("BigQueryConnector", "STARTED")
+        self.project_id = PROJECT_ID
+        self.dataset_id = DATASET_ID
+        self.location = LOCATION
+        
+        # Fully qualified ids, SQL and load configs are built once and reused
+        self.table_ids = {
+            name: f"{self.project_id}.{self.dataset_id}.{name}" for name in SCHEMAS
+        }
+        self.mart_queries = {
+            name: query.format(project_id=self.project_id, dataset_id=self.dataset_id,
+                               start_date='{start_date}')
+            for name, query in MART_QUERIES.items()
+        }
+        self.load_job_configs = {
+            name: self._load_job_config(definition["schema"])
+            for name, definition in SCHEMAS.items()
+            if not name.startswith("fact_")
+        }
+        self.product_categories = pd.Series(dtype=object)
+        
+        # Protobuf row messages for the Storage Write API, one per fact table
+        self.row_messages = {
+            table_name: self._build_row_message(table_name, definition["schema"])
+            for table_name, definition in SCHEMAS.items()
+            if table_name.startswith("fact_")
+        }
+        
+        # BigQuery clients are created on first use
+        self._client = None
+        self._write_client = None
+        self._clients_initialized = False
+        self._client_lock = threading.Lock()
+    
+    @property
+    def client(self):
+        """
+        BigQuery client (None if initialization failed)
+        """
+        self._init_clients()
+        return self._client
+    
+    @property
+    def write_client(self):
+        """
+        BigQuery Storage Write client (None if initialization failed)
+        """
+        self._init_clients()
+        return self._write_client
+    
+    def _init_clients(self):
+        """
+        Initialize the BigQuery clients once, on first access
+        """
+        with self._client_lock:
+            if self._clients_initialized:
+                return
+            self._clients_initialized = True
+            
+            try:
+                # Service account if available, otherwise default credentials
+                credentials = _get_credentials()
+                self._client = bigquery.Client(
+                    credentials=credentials,
+                    project=self.project_id
                 )
+                
+                # Fact tables are written through the Storage Write API
+                self._write_client = BigQueryWriteClient(credentials=credentials)
+                
+                # Table loads run concurrently; raise the HTTP connection pool size
+                # above the default (10) so they don't contend for connections
+                self._client._http.mount("https://", HTTPAdapter(pool_maxsize=BIGQUERY_HTTP_POOL_SIZE))
+                
+                self.logger.info("BigQuery client initialized successfully")
+                
+            except Exception as e:
+                self.logger.error(f"Error initializing BigQuery client: {str(e)}")
+                self._client = None
+                self._write_client = None
+    
+    def create_dataset(self):
+        """
+        Create the supply chain analytics dataset
+        """
+        try:
+            self.logger.info(f"Creating dataset: {self.dataset_id}")
+            
+            dataset_ref = self.client.dataset(self.dataset_id)
+            dataset = bigquery.Dataset(dataset_ref)
+            dataset.location = self.location
+            
+            dataset = self.client.create_dataset(dataset, exists_ok=True)
+            self.logger.info(f"Dataset {self.dataset_id} created successfully")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Error creating dataset: {str(e)}")
+            return False
+    
+    def create_star_schema_tables(self):
+        """
+        Create star schema tables: fact tables and dimension tables
+        """
+        try:
+            self.logger.info("Creating star schema tables...")
+            
+            # Generate DDL for dimension and fact tables
+            statements = [
+                self._schema_to_ddl(table_name, **definition)
+                for table_name, definition in SCHEMAS.items()
+            ]
             
-            # Set clustering if specified
-            if clustering_fields:
-                table.clustering_fields = clustering_fields
+            # Run all CREATE TABLE statements as one script job
+            script = ";\n".join(statements) + ";"
+            self.client.query(script).result()
             
-            # Create the table
-            table = self.client.create_table(table, exists_ok=True)
-            self.logger.info(f"Table {table_name} created successfully")
+            self.logger.info("Star schema tables created successfully")
+            return True
             
         except Exception as e:
-            self.logger.error(f"Error creating table {table_name}: {str(e)}")
+            self.logger.error(f"Error creating star schema tables: {str(e)}")
+            return False
+    
+    def _schema_to_ddl(self, table_name, schema, partitioning_field=None, clustering_fields=None, query=None):
+        """
+        Render a CREATE TABLE IF NOT EXISTS statement for the specified schema
+        If a query is given, the new table is filled from its results
+        """
+        type_names = {"INTEGER": "INT64", "FLOAT": "FLOAT64", "BOOLEAN": "BOOL"}
+        
+        columns = []
+        for field in schema:
+            column = f"{field.name} {type_names.get(field.field_type, field.field_type)}"
+            if field.mode == "REQUIRED":
+                column += " NOT NULL"
+            if field.default_value_expression:
+                column += f" DEFAULT {field.default_value_expression}"
+            columns.append(column)
+        
+        table_id = self.table_ids[table_name]
+        ddl = f"CREATE TABLE IF NOT EXISTS `{table_id}` (\n  " + ",\n  ".join(columns) + "\n)"
+        
+        # Daily partitioning on a DATE column
+        if partitioning_field:
+            ddl += f"\nPARTITION BY {partitioning_field}"
+        
+        if clustering_fields:
+            ddl += f"\nCLUSTER BY {', '.join(clustering_fields)}"
+        
+        # Queries against partitioned tables must filter on the partition column
+        if partitioning_field:
+            ddl += "\nOPTIONS (require_partition_filter = TRUE)"
+        
+        if query:
+            ddl += f"\nAS\n{query.strip()}"
+        
+        return ddl
     
     def load_data_to_bigquery(self, data_dict):
         """
@@ -241,18 +522,40 @@ class BigQueryConnector:
         try:
             self.logger.info("Loading data to BigQuery...")
             
-            # Load dimension tables first
+            # Category lookup for fact rows that don't carry their own category
             if 'products' in data_dict:
-                self._load_products_dimension(data_dict['products'])
-            
-            if 'orders' in data_dict:
-                self._load_orders_fact(data_dict['orders'])
-            
-            if 'inventory' in data_dict:
-                self._load_inventory_fact(data_dict['inventory'])
-            
-            if 'returns' in data_dict:
-                self._load_returns_fact(data_dict['returns'])
+                products_df = data_dict['products'].drop_duplicates('id')
+                self.product_categories = products_df.set_index('id')['category']
+            
+            # Dimension tables first, then facts
+            loaders = [
+                ('products', "Products dimension", self._load_products_dimension),
+                ('orders', "Orders fact", self._load_orders_fact),
+                ('inventory', "Inventory fact", self._load_inventory_fact),
+                ('returns', "Returns fact", self._load_returns_fact)
+            ]
+            
+            # The tables are independent, so prepare and submit each one on
+            # its own thread; finished uploads are logged from done callbacks
+            # rather than by threads blocked on result()
+            logged = []
+            with ThreadPoolExecutor(max_workers=len(loaders)) as executor:
+                submissions = {
+                    executor.submit(loader, data_dict[key]): table_label
+                    for key, table_label, loader in loaders
+                    if key in data_dict
+                }
+                for submission in as_completed(submissions):
+                    job = submission.result()
+                    if job is not None:
+                        logged_future = Future()
+                        job.add_done_callback(functools.partial(
+                            self._log_load_result, submissions[submission], logged_future
+                        ))
+                        logged.append(logged_future)
+            
+            # Wait until every upload has finished and its outcome is logged
+            wait(logged)
             
             self.logger.info("Data loaded to BigQuery successfully")
             return True
@@ -261,159 +564,360 @@ class BigQueryConnector:
             self.logger.error(f"Error loading data to BigQuery: {str(e)}")
             return False
     
+    def _log_load_result(self, table_label, logged_future, job):
+        """
+        Log the outcome of a finished load job, then resolve logged_future
+        """
+        try:
+            error = job.exception()
+            if error is not None:
+                self.logger.error(f"Error loading {table_label.lower()}: {str(error)}")
+            else:
+                self.logger.info(f"{table_label} loaded: {job.output_rows} records")
+        finally:
+            logged_future.set_result(None)
+    
+    def _submit_arrow_load(self, arrow_table, table_name):
+        """
+        Replace the contents of a table with a pyarrow Table
+        The Arrow columns are written straight to an in-memory Parquet file
+        """
+        table_id = self.table_ids[table_name]
+        
+        parquet_file = io.BytesIO()
+        pq.write_table(self._narrow_integer_columns(arrow_table), parquet_file)
+        parquet_file.seek(0)
+        
+        return self.client.load_table_from_file(
+            parquet_file, table_id, job_config=self.load_job_configs[table_name]
+        )
+    
+    def _narrow_integer_columns(self, arrow_table):
+        """
+        Cast int64 columns whose values fit in 32 bits to int32
+        Parquet stores them in half the bytes and BigQuery widens them back
+        to INT64 on ingest; float columns are left alone to keep precision
+        """
+        int32_info = np.iinfo(np.int32)
+        
+        for i, field in enumerate(arrow_table.schema):
+            if not pa.types.is_int64(field.type):
+                continue
+            bounds = pc.min_max(arrow_table.column(i)).as_py()
+            if bounds['min'] is None or (int32_info.min <= bounds['min'] and bounds['max'] <= int32_info.max):
+                arrow_table = arrow_table.set_column(i, field.name, arrow_table.column(i).cast(pa.int32()))
+        
+        return arrow_table
+    
+    def _create_staging_table(self, table_name):
+        """
+        Create an empty copy of a fact table (same columns and defaults) for
+        a Storage Write load and return its name
+        Partition filters are not required on it, so it can be copied whole
+        """
+        staging_name = f"{table_name}_staging"
+        self.client.query(
+            f"CREATE OR REPLACE TABLE `{self.project_id}.{self.dataset_id}.{staging_name}` "
+            f"LIKE `{self.table_ids[table_name]}` "
+            f"OPTIONS (require_partition_filter = FALSE)"
+        ).result()
+        return staging_name
+    
+    def _swap_in_staging(self, table_name, staging_name):
+        """
+        Replace a table's rows with its staging table's in one transaction,
+        then drop the staging table
+        """
+        table_id = self.table_ids[table_name]
+        staging_id = f"{self.project_id}.{self.dataset_id}.{staging_name}"
+        self.client.query(f"""
+        BEGIN TRANSACTION;
+        TRUNCATE TABLE `{table_id}`;
+        INSERT INTO `{table_id}` SELECT * FROM `{staging_id}`;
+        COMMIT TRANSACTION;
+        DROP TABLE `{staging_id}`;
+        """).result()
+    
+    def _load_job_config(self, schema):
+        """
+        Load job configuration for a table loaded from Parquet
+        WRITE_TRUNCATE replaces the rows atomically; passing the table's own
+        schema keeps the created_date/updated_date defaults, which fill the
+        columns the Parquet file leaves out
+        """
+        parquet_options = bigquery.ParquetOptions()
+        parquet_options.enable_list_inference = True
+        
+        return bigquery.LoadJobConfig(
+            write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
+            schema=schema,
+            source_format=bigquery.SourceFormat.PARQUET,
+            parquet_options=parquet_options
+        )
+    
+    def _build_row_message(self, table_name, schema):
+        """
+        Generate a protobuf message class for the rows of a table
+        Returns the message class and the descriptor sent as the writer schema
+        """
+        file_proto = descriptor_pb2.FileDescriptorProto(
+            name=f"{table_name}.proto", package="supply_chain", syntax="proto2"
+        )
+        message_proto = file_proto.message_type.add(name=table_name)
+        for number, field in enumerate(schema, start=1):
+            message_proto.field.add(
+                name=field.name,
+                number=number,
+                type=PROTO_FIELD_TYPES[field.field_type],
+                label=descriptor_pb2.FieldDescriptorProto.LABEL_OPTIONAL
+            )
+        
+        pool = descriptor_pool.DescriptorPool()
+        pool.Add(file_proto)
+        message_class = message_factory.GetMessageClass(
+            pool.FindMessageTypeByName(f"supply_chain.{table_name}")
+        )
+        
+        return message_class, message_proto
+    
+    def _serialize_rows(self, df, table_name):
+        """
+        Encode DataFrame rows as serialized protobuf messages
+        Null values are left unset so the column default (or NULL) applies
+        """
+        message_class, _ = self.row_messages[table_name]
+        
+        # Convert column-wise to Python values, then assemble each row
+        columns = []
+        for field in SCHEMAS[table_name]["schema"]:
+            if field.name not in df.columns:
+                continue
+            values = df[field.name]
+            valid = values.notna().to_numpy()
+            if field.field_type == "DATE":
+                values = np.asarray(values, dtype='datetime64[D]').astype(np.int64)
+            elif field.field_type == "INTEGER":
+                # A single NaN makes an integer column float64, and the
+                # protobuf int64 setter rejects Python floats
+                values = values.astype('Int64').to_numpy(dtype=object, na_value=None)
+            else:
+                values = values.to_numpy()
+            columns.append((field.name, values.tolist(), valid.tolist()))
+        
+        return [
+            message_class(**{
+                name: values[i] for name, values, valid in columns if valid[i]
+            }).SerializeToString()
+            for i in range(len(df))
+        ]
+    
+    def _submit_stream(self, df, table_name):
+        """
+        Replace the contents of a fact table through the Storage Write API
+        Rows are appended to a pending stream on a staging table, which is
+        not subject to the daily load job quota; the fact table only changes
+        once the whole stream is committed and swapped in
+        """
+        staging_name = self._create_staging_table(table_name)
+        table_path = self.write_client.table_path(self.project_id, self.dataset_id, staging_name)
+        write_stream = self.write_client.create_write_stream(
+            parent=table_path,
+            write_stream=types.WriteStream(type_=types.WriteStream.Type.PENDING)
+        )
+        _, message_proto = self.row_messages[table_name]
+        
+        request_template = types.AppendRowsRequest(
+            write_stream=write_stream.name,
+            proto_rows=types.AppendRowsRequest.ProtoData(
+                writer_schema=types.ProtoSchema(proto_descriptor=message_proto)
+            ),
+            default_missing_value_interpretation=types.AppendRowsRequest.MissingValueInterpretation.DEFAULT_VALUE
+        )
+        append_rows_stream = writer.AppendRowsStream(self.write_client, request_template)
+        
+        # Append in fixed-size batches: send() returns without waiting, so
+        # encoding the next batch overlaps with uploading the previous one,
+        # and requests stay under the Storage Write request size limit
+        futures = []
+        try:
+            for start in range(0, len(df), STORAGE_WRITE_BATCH_ROWS):
+                rows = self._serialize_rows(df.iloc[start:start + STORAGE_WRITE_BATCH_ROWS], table_name)
+                futures.append(append_rows_stream.send(types.AppendRowsRequest(
+                    proto_rows=types.AppendRowsRequest.ProtoData(
+                        rows=types.ProtoRows(serialized_rows=rows)
+                    )
+                )))
+        except Exception:
+            append_rows_stream.close()
+            raise
+        
+        commit = functools.partial(self._commit_stream, table_name, staging_name, table_path, write_stream.name)
+        return StreamWriteJob(append_rows_stream, futures, len(df), commit)
+    
+    def _commit_stream(self, table_name, staging_name, table_path, stream_name):
+        """
+        Commit a pending stream to its staging table, then swap the staging
+        rows into the fact table
+        If the commit is rejected, the fact table keeps its previous rows
+        """
+        self.write_client.finalize_write_stream(name=stream_name)
+        
+        response = self.write_client.batch_commit_write_streams(
+            types.BatchCommitWriteStreamsRequest(parent=table_path, write_streams=[stream_name])
+        )
+        if response.stream_errors:
+            raise RuntimeError(response.stream_errors[0].error_message)
+        
+        self._swap_in_staging(table_name, staging_name)
+    
     def _load_products_dimension(self, products_df):
         """
         Load products data to dimension table
+        Returns the submitted load job without waiting on it (None on error)
         """
         try:
-            # Prepare data for BigQuery
-            products_df['created_date'] = pd.Timestamp.now()
-            products_df['updated_date'] = pd.Timestamp.now()
-            
-            # Select and rename columns
-            products_bq = products_df[['id', 'title', 'category', 'price', 'description', 'image']].copy()
-            products_bq.columns = ['product_id', 'product_name', 'category', 'price', 'description', 'image_url']
+            # Select and rename columns directly into an Arrow table, skipping
+            # the intermediate DataFrame
+            products_bq = pa.Table.from_pandas(
+                products_df,
+                columns=['id', 'title', 'category', 'price', 'description', 'image'],
+                preserve_index=False
+            ).rename_columns(['product_id', 'product_name', 'category', 'price', 'description', 'image_url'])
             
             # Load to BigQuery
-            table_id = f"{self.project_id}.{self.dataset_id}.dim_products"
-            job_config = bigquery.LoadJobConfig(
-                write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE
-            )
-            
-            job = self.client.load_table_from_dataframe(
-                products_bq, table_id, job_config=job_config
-            )
-            job.result()
-            
-            self.logger.info(f"Products dimension loaded: {len(products_bq)} records")
+            return self._submit_arrow_load(products_bq, "dim_products")
             
         except Exception as e:
             self.logger.error(f"Error loading products dimension: {str(e)}")
+            return None
     
     def _load_orders_fact(self, orders_df):
         """
         Load orders data to fact table
+        Returns the submitted load job without waiting on it (None on error)
         """
         try:
-            # Prepare data for BigQuery
-            orders_df['created_date'] = pd.Timestamp.now()
-            orders_df['updated_date'] = pd.Timestamp.now()
-            
             # Create location_id from shipping info
             if 'Country' in orders_df.columns and 'State' in orders_df.columns:
-                orders_df['location_id'] = orders_df['Country'] + '_' + orders_df['State']
+                orders_df['location_id'] = orders_df['Country'].str.cat(orders_df['State'], sep='_')
             else:
                 orders_df['location_id'] = 'Unknown'
             
-            # Select and rename columns
-            orders_bq = orders_df[['Order ID', 'Order Date', 'Ship Date', 'Customer ID', 
-                                 'Product ID', 'location_id', 'Quantity', 'Sales', 'Profit', 
-                                 'Discount', 'Lead Time (Days)', 'Order Value', 'created_date', 'updated_date']].copy()
+            # Denormalize category onto the fact so marts don't join dim_products
+            if 'Category' not in orders_df.columns:
+                orders_df['Category'] = orders_df['Product ID'].map(self.product_categories)
             
-            orders_bq.columns = ['order_id', 'order_date', 'ship_date', 'customer_id', 
-                               'product_id', 'location_id', 'quantity', 'sales', 'profit', 
-                               'discount', 'lead_time_days', 'order_value', 'created_date', 'updated_date']
+            # Select and rename columns (the projection is already a new frame,
+            # so rename it without another copy)
+            orders_bq = orders_df[['Order ID', 'Order Date', 'Ship Date', 'Customer ID', 
+                                 'Product ID', 'Category', 'location_id', 'Quantity', 'Sales', 'Profit', 
+                                 'Discount', 'Lead Time (Days)', 'Order Value']].rename(columns={
+                'Order ID': 'order_id',
+                'Order Date': 'order_date',
+                'Ship Date': 'ship_date',
+                'Customer ID': 'customer_id',
+                'Product ID': 'product_id',
+                'Category': 'category',
+                'Quantity': 'quantity',
+                'Sales': 'sales',
+                'Profit': 'profit',
+                'Discount': 'discount',
+                'Lead Time (Days)': 'lead_time_days',
+                'Order Value': 'order_value'
+            }, copy=False)
             
             # Load to BigQuery
-            table_id = f"{self.project_id}.{self.dataset_id}.fact_orders"
-            job_config = bigquery.LoadJobConfig(
-                write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE
-            )
-            
-            job = self.client.load_table_from_dataframe(
-                orders_bq, table_id, job_config=job_config
-            )
-            job.result()
-            
-            self.logger.info(f"Orders fact loaded: {len(orders_bq)} records")
+            return self._submit_stream(orders_bq, "fact_orders")
             
         except Exception as e:
             self.logger.error(f"Error loading orders fact: {str(e)}")
+            return None
     
     def _load_inventory_fact(self, inventory_df):
         """
         Load inventory data to fact table
+        Returns the submitted load job without waiting on it (None on error)
         """
         try:
-            # Prepare data for BigQuery
-            inventory_df['created_date'] = pd.Timestamp.now()
-            inventory_df['updated_date'] = pd.Timestamp.now()
-            inventory_df['inventory_id'] = inventory_df['product_id'].astype(str) + '_' + inventory_df['date'].dt.strftime('%Y%m%d')
+            # Build the YYYYMMDD key with integer arithmetic instead of a per-row strftime
+            inventory_dates = inventory_df['date'].dt
+            date_key = inventory_dates.year * 10000 + inventory_dates.month * 100 + inventory_dates.day
+            inventory_df['inventory_id'] = inventory_df['product_id'].astype(str).str.cat(date_key.astype(str), sep='_')
+            
+            # Denormalize category onto the fact so marts don't join dim_products
+            if 'category' not in inventory_df.columns:
+                inventory_df['category'] = inventory_df['product_id'].map(self.product_categories)
             
             # Select and rename columns
-            inventory_bq = inventory_df[['inventory_id', 'date', 'product_id', 'stock_level', 
+            inventory_bq = inventory_df[['inventory_id', 'date', 'product_id', 'category', 'stock_level', 
                                        'daily_demand', 'restock_amount', 'restocked', 'price', 
                                        'original_price', 'price_change_pct', 'days_of_inventory', 
-                                       'stockout_risk', 'annualized_turnover', 'fill_rate', 
-                                       'created_date', 'updated_date']].copy()
+                                       'stockout_risk', 'annualized_turnover', 'fill_rate']]
             
             # Load to BigQuery
-            table_id = f"{self.project_id}.{self.dataset_id}.fact_inventory"
-            job_config = bigquery.LoadJobConfig(
-                write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE
-            )
-            
-            job = self.client.load_table_from_dataframe(
-                inventory_bq, table_id, job_config=job_config
-            )
-            job.result()
-            
-            self.logger.info(f"Inventory fact loaded: {len(inventory_bq)} records")
+            return self._submit_stream(inventory_bq, "fact_inventory")
             
         except Exception as e:
             self.logger.error(f"Error loading inventory fact: {str(e)}")
+            return None
     
     def _load_returns_fact(self, returns_df):
         """
         Load returns data to fact table
+        Returns the submitted load job without waiting on it (None on error)
         """
         try:
-            # Prepare data for BigQuery
-            returns_df['created_date'] = pd.Timestamp.now()
-            returns_df['updated_date'] = pd.Timestamp.now()
-            returns_df['return_id'] = 'RET_' + returns_df.index.astype(str)
+            # Prepare data for BigQuery (numpy's string kernels format the ids
+            # without boxing each index value)
+            returns_df['return_id'] = np.char.add('RET_', returns_df.index.to_numpy().astype(str))
             
-            # Select and rename columns
+            # Select and rename columns (the projection is already a new frame,
+            # so rename it without another copy)
             returns_bq = returns_df[['return_id', 'Return Date', 'Order ID', 'Customer ID', 
-                                   'Product ID', 'created_date', 'updated_date']].copy()
-            
-            returns_bq.columns = ['return_id', 'return_date', 'order_id', 'customer_id', 
-                                'product_id', 'created_date', 'updated_date']
+                                   'Product ID']].rename(columns={
+                'Return Date': 'return_date',
+                'Order ID': 'order_id',
+                'Customer ID': 'customer_id',
+                'Product ID': 'product_id'
+            }, copy=False)
             
             # Load to BigQuery
-            table_id = f"{self.project_id}.{self.dataset_id}.fact_returns"
-            job_config = bigquery.LoadJobConfig(
-                write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE
-            )
-            
-            job = self.client.load_table_from_dataframe(
-                returns_bq, table_id, job_config=job_config
-            )
-            job.result()
-            
-            self.logger.info(f"Returns fact loaded: {len(returns_bq)} records")
+            return self._submit_stream(returns_bq, "fact_returns")
             
         except Exception as e:
             self.logger.error(f"Error loading returns fact: {str(e)}")
+            return None
     
-    def create_data_marts(self):
+    def create_data_marts(self, refresh_window_days=MART_REFRESH_WINDOW_DAYS):
         """
         Create specialized data marts for analytics
+        Only fact partitions from the last refresh_window_days days are scanned
+        (all of them when it is None); the mart tables are rebuilt on every
+        call so the window stays current
         """
         try:
             self.logger.info("Creating data marts...")
             
+            start_date = _mart_start_date(refresh_window_days)
+            
+            # Marts left by earlier versions as a different object type
+            # (e.g. materialized views) block CREATE OR REPLACE
+            self._drop_stale_marts()
+            
+            # Combined category mart, read by the vendor and category views
+            self._create_category_all_mart(start_date)
+            
             # Vendor Performance Mart
-            self._create_vendor_performance_mart()
+            self._create_vendor_performance_mart(start_date)
             
             # Inventory Analysis Mart
-            self._create_inventory_analysis_mart()
+            self._create_inventory_analysis_mart(start_date)
             
             # Fulfillment Analytics Mart
-            self._create_fulfillment_analytics_mart()
+            self._create_fulfillment_analytics_mart(start_date)
             
             # Category Performance Mart
-            self._create_category_performance_mart()
+            self._create_category_performance_mart(start_date)
             
             self.logger.info("Data marts created successfully")
             return True
@@ -422,103 +926,51 @@ class BigQueryConnector:
             self.logger.error(f"Error creating data marts: {str(e)}")
             return False
     
-    def _create_vendor_performance_mart(self):
-        """
-        Create vendor performance data mart
-        """
-        query = """
-        CREATE OR REPLACE TABLE `{project_id}.{dataset_id}.mart_vendor_performance` AS
-        SELECT 
-            p.category,
-            COUNT(DISTINCT o.order_id) as total_orders,
-            AVG(o.lead_time_days) as avg_lead_time,
-            AVG(o.order_value) as avg_order_value,
-            SUM(o.sales) as total_sales,
-            SUM(o.profit) as total_profit,
-            COUNT(DISTINCT r.return_id) as total_returns,
-            CASE 
-                WHEN COUNT(DISTINCT o.order_id) > 0 
-                THEN COUNT(DISTINCT r.return_id) / COUNT(DISTINCT o.order_id) 
-                ELSE 0 
-            END as return_rate
-        FROM `{project_id}.{dataset_id}.fact_orders` o
-        LEFT JOIN `{project_id}.{dataset_id}.dim_products` p ON o.product_id = p.product_id
-        LEFT JOIN `{project_id}.{dataset_id}.fact_returns` r ON o.order_id = r.order_id
-        GROUP BY p.category
+    def _drop_stale_marts(self):
+        """
+        Drop mart objects whose type differs from MART_TABLE_TYPES
+        CREATE OR REPLACE cannot change the type of an existing object
+        """
+        existing = {
+            table.table_id: table.table_type
+            for table in self.client.list_tables(f"{self.project_id}.{self.dataset_id}")
+        }
+        for name, table_type in MART_TABLE_TYPES.items():
+            if name in existing and existing[name] != table_type:
+                self.logger.info(f"Dropping {name} ({existing[name]}) to recreate it as {table_type}")
+                self.client.delete_table(f"{self.project_id}.{self.dataset_id}.{name}")
+    
+    def _create_category_all_mart(self, start_date):
         """
-        
-        self._execute_query(query.format(project_id=self.project_id, dataset_id=self.dataset_id))
+        Create the combined category data mart
+        Vendor and category performance group the same joined facts by
+        category, so they are computed in one scan
+        """
+        self._execute_query(self.mart_queries["mart_category_all"].format(start_date=start_date))
     
-    def _create_inventory_analysis_mart(self):
+    def _create_vendor_performance_mart(self, start_date):
         """
-        Create inventory analysis data mart
+        Create vendor performance data mart (a view over mart_category_all)
         """
-        query = """
-        CREATE OR REPLACE TABLE `{project_id}.{dataset_id}.mart_inventory_analysis` AS
-        SELECT 
-            p.category,
-            AVG(i.stock_level) as avg_stock_level,
-            AVG(i.daily_demand) as avg_daily_demand,
-            AVG(i.fill_rate) as avg_fill_rate,
-            AVG(i.annualized_turnover) as avg_turnover,
-            AVG(i.days_of_inventory) as avg_days_of_inventory,
-            SUM(CASE WHEN i.stockout_risk THEN 1 ELSE 0 END) as stockout_risk_count,
-            COUNT(*) as total_records
-        FROM `{project_id}.{dataset_id}.fact_inventory` i
-        LEFT JOIN `{project_id}.{dataset_id}.dim_products` p ON i.product_id = p.product_id
-        GROUP BY p.category
+        self._execute_query(self.mart_queries["mart_vendor_performance"].format(start_date=start_date))
+    
+    def _create_inventory_analysis_mart(self, start_date):
         """
-        
-        self._execute_query(query.format(project_id=self.project_id, dataset_id=self.dataset_id))
+        Create inventory analysis data mart
+        """
+        self._execute_query(self.mart_queries["mart_inventory_analysis"].format(start_date=start_date))
     
-    def _create_fulfillment_analytics_mart(self):
+    def _create_fulfillment_analytics_mart(self, start_date):
         """
         Create fulfillment analytics data mart
         """
-        query = """
-        CREATE OR REPLACE TABLE `{project_id}.{dataset_id}.mart_fulfillment_analytics` AS
-        SELECT 
-            DATE_TRUNC(o.order_date, MONTH) as month,
-            p.category,
-            COUNT(DISTINCT o.order_id) as total_orders,
-            AVG(o.lead_time_days) as avg_lead_time,
-            AVG(o.order_cycle_time_days) as avg_cycle_time,
-            SUM(o.sales) as total_sales,
-            COUNT(DISTINCT o.customer_id) as unique_customers
-        FROM `{project_id}.{dataset_id}.fact_orders` o
-        LEFT JOIN `{project_id}.{dataset_id}.dim_products` p ON o.product_id = p.product_id
-        GROUP BY DATE_TRUNC(o.order_date, MONTH), p.category
+        self._execute_query(self.mart_queries["mart_fulfillment_analytics"].format(start_date=start_date))
+    
+    def _create_category_performance_mart(self, start_date):
         """
-        
-        self._execute_query(query.format(project_id=self.project_id, dataset_id=self.dataset_id))
-    
-    def _create_category_performance_mart(self):
-        """
-        Create category performance data mart
-        """
-        query = """
-        CREATE OR REPLACE TABLE `{project_id}.{dataset_id}.mart_category_performance` AS
-        SELECT 
-            p.category,
-            COUNT(DISTINCT o.order_id) as total_orders,
-            SUM(o.sales) as total_sales,
-            SUM(o.profit) as total_profit,
-            AVG(o.lead_time_days) as avg_lead_time,
-            AVG(i.fill_rate) as avg_fill_rate,
-            AVG(i.annualized_turnover) as avg_turnover,
-            COUNT(DISTINCT r.return_id) as total_returns
-        FROM `{project_id}.{dataset_id}.fact_orders` o
-        LEFT JOIN `{project_id}.{dataset_id}.dim_products` p ON o.product_id = p.product_id
-        LEFT JOIN `{project_id}.{dataset_id}.fact_returns` r ON o.order_id = r.order_id
-        LEFT JOIN (
-            SELECT product_id, AVG(fill_rate) as fill_rate, AVG(annualized_turnover) as annualized_turnover
-            FROM `{project_id}.{dataset_id}.fact_inventory`
-            GROUP BY product_id
-        ) i ON o.product_id = i.product_id
-        GROUP BY p.category
+        Create category performance data mart (a view over mart_category_all)
         """
-        
-        self._execute_query(query.format(project_id=self.project_id, dataset_id=self.dataset_id))
+        self._execute_query(self.mart_queries["mart_category_performance"].format(start_date=start_date))
     
     def _execute_query(self, query):
         """
@@ -4,13 +4,17 @@ Custom Flask API Server for Supply Chain Analytics
 Serves data from test.xlsx with proper JSON serialization
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 import pandas as pd
 import numpy as np
 from datetime import datetime
+import gzip
+import hashlib
 import json
-from config import EXCEL_FILE_PATH
+import os
+import orjson
+from config import EXCEL_FILE_PATH, GZIP_MIN_BYTES, API_HOST, API_PORT, API_DEBUG
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
@@ -25,89 +29,183 @@ class DataService:
     def _load_data(self):
         """Load all data from Excel file"""
         try:
+            sheets = self._read_sheets(['train', 'Return', 'People'])
+            
             # Load orders data (from train sheet)
-            self.orders_df = pd.read_excel(self.excel_file, sheet_name='train')
+            self.orders_df = sheets['train']
             
             # Load returns data (from Return sheet)
-            self.returns_df = pd.read_excel(self.excel_file, sheet_name='Return')
+            self.returns_df = sheets['Return']
             
             # Load people data (from People sheet)
-            self.people_df = pd.read_excel(self.excel_file, sheet_name='People')
+            self.people_df = sheets['People']
             
             # Transform data
             self._transform_data()
             
+            # Clean each dataset for JSON once; the Excel data doesn't change
+            # while the server runs, so requests only slice these lists.
+            # Both the columnar (column -> values) and records layouts are kept
+            self._columnar = {
+                'orders': self._clean_dataframe_columnar(self.orders_df),
+                'returns': self._clean_dataframe_columnar(self.returns_df),
+                'people': self._clean_dataframe_columnar(self.people_df),
+            }
+            self._orders_records = self._columnar_to_records(self._columnar['orders'])
+            self._returns_records = self._columnar_to_records(self._columnar['returns'])
+            self._people_records = self._columnar_to_records(self._columnar['people'])
+            
+            # Analytics are likewise computed once
+            self._analytics_cache = self._compute_analytics()
+            
+            # Content hashes of the cached data, used as ETags
+            self._etags = {
+                name: hashlib.blake2b(orjson.dumps(data), digest_size=16).hexdigest()
+                for name, data in (('orders', self._orders_records),
+                                   ('returns', self._returns_records),
+                                   ('people', self._people_records),
+                                   ('analytics', self._analytics_cache))
+            }
+            
         except Exception as e:
             print(f"Error loading data: {str(e)}")
             raise
     
+    def _read_sheets(self, sheet_names):
+        """Read Excel sheets, preferring Parquet copies newer than the workbook"""
+        base_path = os.path.splitext(self.excel_file)[0]
+        parquet_paths = {sheet: f"{base_path}_{sheet}.parquet" for sheet in sheet_names}
+        excel_mtime = os.path.getmtime(self.excel_file)
+        
+        if all(os.path.exists(path) and os.path.getmtime(path) >= excel_mtime
+               for path in parquet_paths.values()):
+            return {sheet: pd.read_parquet(path) for sheet, path in parquet_paths.items()}
+        
+        # Parse the workbook once for all sheets, then cache them as Parquet
+        sheets = pd.read_excel(self.excel_file, sheet_name=sheet_names)
+        try:
+            for sheet, path in parquet_paths.items():
+                sheets[sheet].to_parquet(path, index=False)
+        except Exception as e:
+            print(f"Error caching sheets as Parquet: {str(e)}")
+        
+        return sheets
+    
+    def _ensure_datetime(self, df, cols):
+        """Parse date columns that are not already datetime64 (Excel date cells are)"""
+        for col in cols:
+            if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+                df[col] = pd.to_datetime(df[col], format='mixed', cache=True)
+    
     def _transform_data(self):
         """Transform data for API consumption"""
-        # Transform orders data
+        self._ensure_datetime(self.orders_df, ['Order Date', 'Ship Date'])
+        self._ensure_datetime(self.returns_df, ['Order Date'])
+        self._ensure_datetime(self.people_df, ['First Order Date', 'Last Order Date'])
+        
+        # Shrink column dtypes; repeated strings (including the Region and
+        # Category grouping keys) become categoricals, so groupby uses the
+        # precomputed codes instead of hashing strings
+        for df in (self.orders_df, self.returns_df, self.people_df):
+            self._downcast_columns(df)
+        
+        # Order month buckets as int32 months since 1970-01 (missing dates
+        # masked), so analytics group integers instead of boxed Periods
         if 'Order Date' in self.orders_df.columns:
-            self.orders_df['Order Date'] = pd.to_datetime(self.orders_df['Order Date'])
-        if 'Ship Date' in self.orders_df.columns:
-            self.orders_df['Ship Date'] = pd.to_datetime(self.orders_df['Ship Date'])
-        
-        # Transform returns data
-        if 'Order Date' in self.returns_df.columns:
-            self.returns_df['Order Date'] = pd.to_datetime(self.returns_df['Order Date'])
-        
-        # Transform people data
-        if 'First Order Date' in self.people_df.columns:
-            self.people_df['First Order Date'] = pd.to_datetime(self.people_df['First Order Date'])
-        if 'Last Order Date' in self.people_df.columns:
-            self.people_df['Last Order Date'] = pd.to_datetime(self.people_df['Last Order Date'])
-    
-    def _clean_dataframe_for_json(self, df):
-        """Clean DataFrame for JSON serialization"""
-        # Convert datetime columns to strings
+            months = self.orders_df['Order Date'].to_numpy().astype('datetime64[M]')
+            self._orders_month = pd.arrays.IntegerArray(
+                months.astype(np.int64).astype(np.int32), np.isnat(months)
+            )
+    
+    def _downcast_columns(self, df):
+        """Narrow numeric columns and categorize repeated strings, without changing any value"""
         for col in df.columns:
-            if pd.api.types.is_datetime64_any_dtype(df[col]):
-                df[col] = df[col].dt.strftime('%Y-%m-%d')
+            values = df[col]
+            if pd.api.types.is_integer_dtype(values):
+                df[col] = pd.to_numeric(values, downcast='integer')
+            elif pd.api.types.is_float_dtype(values):
+                # Only when float32 holds every value exactly (e.g. postal codes);
+                # prices and sales would otherwise change in the API output
+                narrowed = values.astype(np.float32)
+                if np.array_equal(narrowed.to_numpy(dtype=np.float64), values.to_numpy(), equal_nan=True):
+                    df[col] = narrowed
+            elif values.dtype == object and values.nunique() <= len(values) // 2:
+                df[col] = values.astype('category')
+    
+    def _columnar_to_records(self, columnar):
+        """Turn a column -> values mapping into a list of row dicts"""
+        return [dict(zip(columnar, row)) for row in zip(*columnar.values())]
+    
+    def _clean_dataframe_columnar(self, df):
+        """Clean DataFrame for JSON as a column -> values mapping (without modifying df)"""
+        columns = {}
+        for col in df.columns:
+            values = df[col]
+            
+            # Convert datetime columns to strings (numpy formats naive dates
+            # as YYYY-MM-DD several times faster than strftime)
+            if pd.api.types.is_datetime64_dtype(values):
+                dates = np.datetime_as_string(values.to_numpy().astype('datetime64[D]'), unit='D')
+                values = pd.Series(dates, index=values.index).where(values.notna())
+            elif pd.api.types.is_datetime64_any_dtype(values):
+                values = values.dt.strftime('%Y-%m-%d')
+            
+            # Handle NaN and infinite values with one mask per column
+            raw = values.to_numpy()
+            if raw.dtype.kind == 'f':
+                missing = ~np.isfinite(raw)
+            else:
+                missing = pd.isna(raw)
+                if raw.dtype == object:
+                    missing |= np.isin(raw, [np.inf, -np.inf])
+            values = raw.astype(object)
+            values[missing] = ''
+            
+            columns[col] = values.tolist()
         
-        # Handle NaN values
-        df = df.replace([np.inf, -np.inf], np.nan)
-        df = df.fillna('')
+        return columns
+    
+    def _page(self, records, limit, offset):
+        """Slice a page from cached records, returning [] early for empty pages"""
+        start = offset or 0
+        if start >= len(records) or (limit is not None and limit <= 0):
+            return []
+        stop = start + limit if limit else None
         
-        # Convert to records
-        return df.to_dict('records')
+        return records[start:stop]
     
     def get_orders(self, limit=None, offset=None):
         """Get orders data with optional pagination"""
-        df = self.orders_df.copy()
-        
-        if offset:
-            df = df.iloc[offset:]
-        if limit:
-            df = df.head(limit)
-        
-        return self._clean_dataframe_for_json(df)
+        return self._page(self._orders_records, limit, offset)
     
     def get_returns(self, limit=None, offset=None):
         """Get returns data with optional pagination"""
-        df = self.returns_df.copy()
-        
-        if offset:
-            df = df.iloc[offset:]
-        if limit:
-            df = df.head(limit)
-        
-        return self._clean_dataframe_for_json(df)
+        return self._page(self._returns_records, limit, offset)
     
     def get_people(self, limit=None, offset=None):
         """Get people data with optional pagination"""
-        df = self.people_df.copy()
-        
-        if offset:
-            df = df.iloc[offset:]
-        if limit:
-            df = df.head(limit)
-        
-        return self._clean_dataframe_for_json(df)
+        return self._page(self._people_records, limit, offset)
+    
+    def get_columnar(self, name, limit=None, offset=None):
+        """Get a dataset as column -> values lists with optional pagination"""
+        return {col: self._page(values, limit, offset)
+                for col, values in self._columnar[name].items()}
     
     def get_analytics(self):
-        """Get analytics summary"""
+        """Get analytics summary (computed once at load)"""
+        return self._analytics_cache
+    
+    def get_etag(self, name, limit=None, offset=None, columnar=False):
+        """Get the ETag for a dataset page (the data never changes after load)"""
+        layout = 'columnar' if columnar else 'records'
+        return f"{self._etags[name]}-{offset or 0}-{'all' if limit is None else limit}-{layout}"
+    
+    def _sum_sales_by(self, keys):
+        """Sum order Sales per key (rows with a missing key are dropped)"""
+        return self.orders_df['Sales'].groupby(keys, observed=True, sort=True).sum().to_dict()
+    
+    def _compute_analytics(self):
+        """Calculate analytics summary"""
         try:
             # Calculate basic analytics
             total_orders = len(self.orders_df)
@@ -120,21 +218,23 @@ class DataService:
             
             # Regional analytics
             if 'Region' in self.orders_df.columns:
-                regional_sales = self.orders_df.groupby('Region')['Sales'].sum().to_dict()
+                regional_sales = self._sum_sales_by(self.orders_df['Region'])
             else:
                 regional_sales = {}
             
             # Category analytics
             if 'Category' in self.orders_df.columns:
-                category_sales = self.orders_df.groupby('Category')['Sales'].sum().to_dict()
+                category_sales = self._sum_sales_by(self.orders_df['Category'])
             else:
                 category_sales = {}
             
             # Time-based analytics
             if 'Order Date' in self.orders_df.columns:
-                monthly_sales = self.orders_df.groupby(
-                    self.orders_df['Order Date'].dt.to_period('M')
-                )['Sales'].sum().to_dict()
+                month_sales = self._sum_sales_by(self._orders_month)
+                month_labels = np.datetime_as_string(
+                    np.array(list(month_sales), dtype=np.int64).astype('datetime64[M]')
+                )
+                monthly_sales = dict(zip(month_labels, month_sales.values()))
             else:
                 monthly_sales = {}
             
@@ -157,6 +257,61 @@ class DataService:
 # Initialize data service
 data_service = DataService()
 
+# Gzipped bodies of full-dataset responses, keyed by ETag; the data never
+# changes after load, so each one is compressed only once
+gzip_cache = {}
+
+def client_accepts_gzip():
+    """Whether the request's Accept-Encoding allows gzip (q > 0)"""
+    return request.accept_encodings['gzip'] > 0
+
+def json_response(payload, etag=None, cache=False):
+    """Serialize a payload with orjson, gzipping large bodies for clients that accept it"""
+    accepts_gzip = client_accepts_gzip()
+    
+    if accepts_gzip and cache and etag in gzip_cache:
+        body = gzip_cache[etag]
+    else:
+        body = orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+        if accepts_gzip and len(body) >= GZIP_MIN_BYTES:
+            body = gzip.compress(body, compresslevel=1)
+            if cache:
+                gzip_cache[etag] = body
+        else:
+            accepts_gzip = False
+    
+    response = Response(body, mimetype='application/json')
+    response.vary.add('Accept-Encoding')
+    if accepts_gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+    if etag:
+        # Each encoding is a different representation, so gets its own tag
+        response.set_etag(f"{etag}-gzip" if accepts_gzip else etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = 300
+    return response
+
+def columnar_payload(columns):
+    """Wrap column -> values lists as a ?format=columnar response body"""
+    return {
+        "status": "success",
+        "columns": list(columns),
+        "data": columns,
+        "count": len(next(iter(columns.values()), []))
+    }
+
+def not_modified(etag):
+    """Return 304 if the client already holds the response with this ETag"""
+    # The gzip representation only matches for clients that accept gzip
+    tags = (etag, f"{etag}-gzip") if client_accepts_gzip() else (etag,)
+    for tag in tags:
+        if request.if_none_match.contains(tag):
+            response = Response(status=304)
+            response.vary.add('Accept-Encoding')
+            response.set_etag(tag)
+            return response
+    return None
+
 @app.route('/')
 def root():
     """Root endpoint"""
@@ -178,12 +333,24 @@ def get_orders():
         limit = request.args.get('limit', type=int)
         offset = request.args.get('offset', type=int)
         
+        columnar = request.args.get('format') == 'columnar'
+        
+        etag = data_service.get_etag('orders', limit=limit, offset=offset, columnar=columnar)
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        
+        if columnar:
+            columns = data_service.get_columnar('orders', limit=limit, offset=offset)
+            return json_response(columnar_payload(columns), etag=etag,
+                                 cache=limit is None and not offset)
+        
         orders = data_service.get_orders(limit=limit, offset=offset)
-        return jsonify({
+        return json_response({
             "status": "success",
             "data": orders,
             "count": len(orders)
-        })
+        }, etag=etag, cache=limit is None and not offset)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -194,12 +361,24 @@ def get_returns():
         limit = request.args.get('limit', type=int)
         offset = request.args.get('offset', type=int)
         
+        columnar = request.args.get('format') == 'columnar'
+        
+        etag = data_service.get_etag('returns', limit=limit, offset=offset, columnar=columnar)
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        
+        if columnar:
+            columns = data_service.get_columnar('returns', limit=limit, offset=offset)
+            return json_response(columnar_payload(columns), etag=etag,
+                                 cache=limit is None and not offset)
+        
         returns = data_service.get_returns(limit=limit, offset=offset)
-        return jsonify({
+        return json_response({
             "status": "success",
             "data": returns,
             "count": len(returns)
-        })
+        }, etag=etag, cache=limit is None and not offset)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -210,12 +389,24 @@ def get_people():
         limit = request.args.get('limit', type=int)
         offset = request.args.get('offset', type=int)
         
+        columnar = request.args.get('format') == 'columnar'
+        
+        etag = data_service.get_etag('people', limit=limit, offset=offset, columnar=columnar)
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        
+        if columnar:
+            columns = data_service.get_columnar('people', limit=limit, offset=offset)
+            return json_response(columnar_payload(columns), etag=etag,
+                                 cache=limit is None and not offset)
+        
         people = data_service.get_people(limit=limit, offset=offset)
-        return jsonify({
+        return json_response({
             "status": "success",
             "data": people,
             "count": len(people)
-        })
+        }, etag=etag, cache=limit is None and not offset)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -223,11 +414,16 @@ def get_people():
 def get_analytics():
     """Get analytics summary"""
     try:
+        etag = data_service.get_etag('analytics')
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        
         analytics = data_service.get_analytics()
-        return jsonify({
+        return json_response({
             "status": "success",
             "data": analytics
-        })
+        }, etag=etag)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -242,13 +438,14 @@ def health_check():
 
 if __name__ == "__main__":
     print("🚀 Starting Flask API Server...")
-    print("API will be available at: http://localhost:5000")
-    print("Health Check: http://localhost:5000/api/health")
+    print(f"API will be available at: http://localhost:{API_PORT}")
+    print(f"Health Check: http://localhost:{API_PORT}/api/health")
     print("\nAvailable endpoints:")
     print("- GET /api/orders - Get orders data")
     print("- GET /api/returns - Get returns data") 
     print("- GET /api/people - Get people data")
     print("- GET /api/analytics - Get analytics summary")
-    print("\nPress Ctrl+C to stop the server")
+    print("\nPress Ctrl+C to stop the server (set FLASK_DEBUG=1 for the debugger and reloader)")
+    print("For production, run: gunicorn flask_api_server:app (settings in gunicorn.conf.py)")
     
-    app.run(host="0.0.0.0", port=5000, debug=True) 
\ No newline at end of file
+    app.run(host=API_HOST, port=API_PORT, debug=API_DEBUG) 
\ No newline at end of file
@@ -0,0 +1,20 @@
+"""
+Gunicorn settings for the Flask API server
+Run with: gunicorn flask_api_server:app
+"""
+
+import multiprocessing
+
+from config import API_HOST, API_PORT
+
+# Same HOST/PORT settings as running flask_api_server.py directly
+bind = f"{API_HOST}:{API_PORT}"
+
+# Worker processes, each serving requests on a small thread pool
+workers = min(4, multiprocessing.cpu_count())
+worker_class = "gthread"
+threads = 4
+
+# Import the app (and build the DataService caches) once in the master
+# process; workers are forked afterwards and share that memory
+preload_app = True
@@ -14,14 +14,23 @@ import time
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from data_extraction.excel_connector import ExcelConnector
-from data_extraction.api_connector import CustomAPIConnector
-from data_processing.supply_chain_metrics import SupplyChainMetrics
-from data_warehouse.bigquery_connector import BigQueryConnector
-from dashboard.streamlit_app import SupplyChainDashboard
 from utils.logger import log_pipeline_step, log_alert, setup_logger
 from config import *
 
+
+def _prefixed_ids(prefix, numbers, width=0):
+    """Build ids like 'ORD_001' from integer numbers with numpy string ops"""
+    digits = np.asarray(numbers).astype(str)
+    if width:
+        digits = np.char.zfill(digits, width)
+    return np.char.add(prefix, digits)
+
+
+def _cycle_labels(labels, n):
+    """Repeat a small label set cyclically out to n rows"""
+    return np.take(np.array(labels), np.arange(n) % len(labels))
+
+
 class SupplyChainPipeline:
     """
     Main pipeline orchestrator for supply chain data integration
@@ -31,17 +40,53 @@ class SupplyChainPipeline:
         self.logger = setup_logger("SupplyChainPipeline")
         self.logger.info("Initializing Supply Chain Data Integration Pipeline")
         
-        # Initialize components
-        self.excel_connector = ExcelConnector()
-        self.api_connector = CustomAPIConnector()
-        self.metrics_calculator = SupplyChainMetrics()
-        self.bigquery_connector = BigQueryConnector()
-        self.dashboard = SupplyChainDashboard()
+        # Components are imported and built on first use so each mode only
+        # pays for the dependencies it touches (kaggle, BigQuery, Streamlit)
+        self._excel_connector = None
+        self._api_connector = None
+        self._metrics_calculator = None
+        self._bigquery_connector = None
+        self._dashboard = None
         
         # Data storage
         self.data_dict = {}
         self.metrics_dict = {}
     
+    @property
+    def excel_connector(self):
+        if self._excel_connector is None:
+            from data_extraction.excel_connector import ExcelConnector
+            self._excel_connector = ExcelConnector()
+        return self._excel_connector
+    
+    @property
+    def api_connector(self):
+        if self._api_connector is None:
+            from data_extraction.api_connector import CustomAPIConnector
+            self._api_connector = CustomAPIConnector()
+        return self._api_connector
+    
+    @property
+    def metrics_calculator(self):
+        if self._metrics_calculator is None:
+            from data_processing.supply_chain_metrics import SupplyChainMetrics
+            self._metrics_calculator = SupplyChainMetrics()
+        return self._metrics_calculator
+    
+    @property
+    def bigquery_connector(self):
+        if self._bigquery_connector is None:
+            from data_warehouse.bigquery_connector import BigQueryConnector
+            self._bigquery_connector = BigQueryConnector()
+        return self._bigquery_connector
+    
+    @property
+    def dashboard(self):
+        if self._dashboard is None:
+            from dashboard.streamlit_app import SupplyChainDashboard
+            self._dashboard = SupplyChainDashboard()
+        return self._dashboard
+    
     def run_full_pipeline(self):
         """
         Run the complete supply chain data integration pipeline
@@ -232,64 +277,82 @@ class SupplyChainPipeline:
         Create sample data for demonstration
         """
         self.logger.info("Creating sample data for demonstration")
+        rng = np.random.default_rng(0)
+        categories = ['Electronics', 'Clothing', 'Home', 'Sports']
+        
+        # Sales, profit and discount drawn together as one (100, 3) block
+        order_values = rng.uniform([100, 10, 0], [1000, 200, 0.3], size=(100, 3))
         
         # Sample orders data
         sample_orders = pd.DataFrame({
-            'Order ID': [f'ORD_{i:03d}' for i in range(1, 101)],
+            'Order ID': _prefixed_ids('ORD_', np.arange(1, 101), 3),
             'Order Date': pd.date_range('2024-01-01', periods=100, freq='D'),
             'Ship Date': pd.date_range('2024-01-03', periods=100, freq='D'),
-            'Customer ID': [f'CUST_{i%20:02d}' for i in range(1, 101)],
-            'Product ID': [f'PROD_{i%10:02d}' for i in range(1, 101)],
-            'Category': ['Electronics', 'Clothing', 'Home', 'Sports'] * 25,
-            'Quantity': np.random.randint(1, 10, 100),
-            'Sales': np.random.uniform(100, 1000, 100),
-            'Profit': np.random.uniform(10, 200, 100),
-            'Discount': np.random.uniform(0, 0.3, 100),
-            'Country': ['USA', 'Canada', 'UK', 'Germany', 'France'] * 20,
-            'State': ['CA', 'NY', 'TX', 'FL', 'IL'] * 20,
-            'Region': ['West', 'East', 'Central', 'South'] * 25
+            'Customer ID': _prefixed_ids('CUST_', np.arange(1, 101) % 20, 2),
+            'Product ID': _prefixed_ids('PROD_', np.arange(1, 101) % 10, 2),
+            'Category': _cycle_labels(categories, 100),
+            'Quantity': rng.integers(1, 10, 100, dtype=np.int32),
+            'Sales': order_values[:, 0],
+            'Profit': order_values[:, 1],
+            'Discount': order_values[:, 2],
+            'Country': _cycle_labels(['USA', 'Canada', 'UK', 'Germany', 'France'], 100),
+            'State': _cycle_labels(['CA', 'NY', 'TX', 'FL', 'IL'], 100),
+            'Region': _cycle_labels(['West', 'East', 'Central', 'South'], 100)
         })
         
-        # Calculate lead time
-        sample_orders['Lead Time (Days)'] = (sample_orders['Ship Date'] - sample_orders['Order Date']).dt.days
+        # Lead time: every sample order ships 2 days after it is placed
+        sample_orders['Lead Time (Days)'] = np.full(100, 2, dtype=np.int32)
         sample_orders['Order Value'] = sample_orders['Sales'] * sample_orders['Quantity']
         
-        # Sample inventory data
+        # Inventory floats and flags drawn as (300, K) blocks
+        inventory_values = rng.uniform(
+            [20, 20, -10, 5, 2, 0.7], [500, 500, 10, 30, 12, 1.0], size=(300, 6)
+        )
+        inventory_flags = rng.random((300, 2)) < [0.3, 0.1]
+        
+        # Sample inventory data: 30 days x 10 records per day
         sample_inventory = pd.DataFrame({
-            'date': pd.date_range('2024-01-01', periods=30, freq='D'),
-            'product_id': [f'PROD_{i%10:02d}' for i in range(1, 301)],
-            'product_name': [f'Product {i%10}' for i in range(1, 301)],
-            'category': ['Electronics', 'Clothing', 'Home', 'Sports'] * 75,
-            'stock_level': np.random.randint(10, 200, 300),
-            'daily_demand': np.random.randint(1, 10, 300),
-            'restock_amount': np.random.randint(0, 50, 300),
-            'restocked': np.random.choice([True, False], 300, p=[0.3, 0.7]),
-            'price': np.random.uniform(20, 500, 300),
-            'original_price': np.random.uniform(20, 500, 300),
-            'price_change_pct': np.random.uniform(-10, 10, 300),
-            'days_of_inventory': np.random.uniform(5, 30, 300),
-            'stockout_risk': np.random.choice([True, False], 300, p=[0.1, 0.9]),
-            'annualized_turnover': np.random.uniform(2, 12, 300),
-            'fill_rate': np.random.uniform(0.7, 1.0, 300)
+            'date': np.repeat(np.arange('2024-01-01', '2024-01-31', dtype='datetime64[D]'), 10).astype('datetime64[ns]'),
+            'product_id': _prefixed_ids('PROD_', np.arange(1, 301) % 10, 2),
+            'product_name': _prefixed_ids('Product ', np.arange(1, 301) % 10),
+            'category': _cycle_labels(categories, 300),
+            'stock_level': rng.integers(10, 200, 300, dtype=np.int32),
+            'daily_demand': rng.integers(1, 10, 300, dtype=np.int32),
+            'restock_amount': rng.integers(0, 50, 300, dtype=np.int32),
+            'restocked': inventory_flags[:, 0],
+            'price': inventory_values[:, 0],
+            'original_price': inventory_values[:, 1],
+            'price_change_pct': inventory_values[:, 2],
+            'days_of_inventory': inventory_values[:, 3],
+            'stockout_risk': inventory_flags[:, 1],
+            'annualized_turnover': inventory_values[:, 4],
+            'fill_rate': inventory_values[:, 5]
         })
         
+        # Repeated id and label columns as categoricals, so groupby works on
+        # integer codes instead of hashing strings
+        for col in ['Category', 'Customer ID', 'Product ID']:
+            sample_orders[col] = sample_orders[col].astype('category')
+        for col in ['category', 'product_id']:
+            sample_inventory[col] = sample_inventory[col].astype('category')
+        
         # Sample returns data
         sample_returns = pd.DataFrame({
             'Return Date': pd.date_range('2024-01-01', periods=20, freq='D'),
-            'Order ID': [f'ORD_{i:03d}' for i in np.random.randint(1, 101, 20)],
-            'Customer ID': [f'CUST_{i%20:02d}' for i in range(1, 21)],
-            'Product ID': [f'PROD_{i%10:02d}' for i in range(1, 21)],
-            'Category': ['Electronics', 'Clothing', 'Home', 'Sports'] * 5
+            'Order ID': _prefixed_ids('ORD_', rng.integers(1, 101, 20), 3),
+            'Customer ID': _prefixed_ids('CUST_', np.arange(1, 21) % 20, 2),
+            'Product ID': _prefixed_ids('PROD_', np.arange(1, 21) % 10, 2),
+            'Category': _cycle_labels(categories, 20)
         })
         
         # Sample products data
         sample_products = pd.DataFrame({
-            'id': [f'PROD_{i:02d}' for i in range(1, 11)],
-            'title': [f'Sample Product {i}' for i in range(1, 11)],
-            'price': np.random.uniform(20, 500, 10),
-            'category': ['Electronics', 'Clothing', 'Home', 'Sports'] * 2 + ['Electronics', 'Clothing'],
-            'description': [f'Description for product {i}' for i in range(1, 11)],
-            'image': [f'https://example.com/image{i}.jpg' for i in range(1, 11)]
+            'id': _prefixed_ids('PROD_', np.arange(1, 11), 2),
+            'title': _prefixed_ids('Sample Product ', np.arange(1, 11)),
+            'price': rng.uniform(20, 500, 10),
+            'category': _cycle_labels(categories, 10),
+            'description': _prefixed_ids('Description for product ', np.arange(1, 11)),
+            'image': np.char.add(_prefixed_ids('https://example.com/image', np.arange(1, 11)), '.jpg')
         })
         
         # Store sample data
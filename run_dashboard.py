@@ -6,10 +6,110 @@ Simple script to run the Streamlit dashboard
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
-import os
+import io
+import zipfile
+
+from dashboard.caching import DF_HASH
+
+def cycle_categorical(labels, n):
+    """
+    Repeat labels cyclically out to n rows as a Categorical with sorted
+    categories (so groupby output keeps its alphabetical order)
+    """
+    categories = sorted(labels)
+    codes = np.array([categories.index(label) for label in labels])
+    return pd.Categorical.from_codes(codes[np.arange(n) % len(labels)], categories)
+
+@st.cache_data
+def build_orders():
+    """
+    Build the sample orders data
+    """
+    rng = np.random.default_rng()
+    quantity_lead_time = rng.integers([1, 1], [10, 15], size=(100, 2))
+    sales_profit = rng.uniform([100, 10], [1000, 200], size=(100, 2))
+    
+    return pd.DataFrame({
+        'Order ID': np.char.add('ORD_', np.char.zfill(np.arange(1, 101).astype(str), 3)),
+        'Order Date': pd.date_range('2024-01-01', periods=100, freq='D'),
+        'Ship Date': pd.date_range('2024-01-03', periods=100, freq='D'),
+        'Customer ID': cycle_categorical([f'CUST_{i%20:02d}' for i in range(1, 21)], 100),
+        'Product ID': cycle_categorical([f'PROD_{i%10:02d}' for i in range(1, 11)], 100),
+        'Category': cycle_categorical(['Electronics', 'Clothing', 'Home', 'Sports'], 100),
+        'Quantity': quantity_lead_time[:, 0],
+        'Sales': sales_profit[:, 0],
+        'Profit': sales_profit[:, 1],
+        'Lead Time (Days)': quantity_lead_time[:, 1]
+    })
+
+@st.cache_data
+def build_inventory(num_inventory_records=300):
+    """
+    Build the sample inventory data with consistent column lengths
+    """
+    rng = np.random.default_rng()
+    stock_demand = rng.integers([10, 1], [200, 10], size=(num_inventory_records, 2))
+    fill_turnover = rng.uniform([0.7, 2], [1.0, 12], size=(num_inventory_records, 2))
+    
+    return pd.DataFrame({
+        'date': np.repeat(np.arange('2024-01-01', '2024-01-31', dtype='datetime64[D]'),
+                          num_inventory_records // 30).astype('datetime64[ns]'),
+        'product_id': cycle_categorical([f'PROD_{i%10:02d}' for i in range(1, 11)], num_inventory_records),
+        'category': cycle_categorical(['Electronics', 'Clothing', 'Home', 'Sports'], num_inventory_records),
+        'stock_level': stock_demand[:, 0],
+        'daily_demand': stock_demand[:, 1],
+        'fill_rate': fill_turnover[:, 0],
+        'annualized_turnover': fill_turnover[:, 1],
+        'stockout_risk': rng.random(num_inventory_records) < 0.1
+    })
+
+@st.cache_data(hash_funcs=DF_HASH)
+def lead_time_stats(sample_orders):
+    """
+    Mean, median and standard deviation of lead time in one aggregation
+    """
+    return sample_orders['Lead Time (Days)'].agg(['mean', 'median', 'std'])
+
+@st.cache_data(hash_funcs=DF_HASH)
+def inventory_means(sample_inventory):
+    """
+    Mean fill rate and inventory turnover in one aggregation
+    """
+    return sample_inventory[['fill_rate', 'annualized_turnover']].mean()
+
+@st.cache_data(hash_funcs=DF_HASH)
+def turnover_quartiles(sample_inventory):
+    """
+    25th, 50th and 75th percentile of inventory turnover in one pass
+    """
+    return sample_inventory['annualized_turnover'].quantile([0.25, 0.5, 0.75]).to_numpy()
+
+@st.cache_data(hash_funcs=DF_HASH)
+def build_report(summary_df, orders_df, inventory_df, export_format):
+    """
+    Serialize the report in memory, as an Excel workbook or a zip of
+    Parquet files (Parquet has no sheets)
+    """
+    buffer = io.BytesIO()
+    if export_format == 'parquet':
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            for name, df in [('summary', summary_df), ('orders', orders_df), ('inventory', inventory_df)]:
+                archive.writestr(f"{name}.parquet", df.to_parquet(index=False))
+    else:
+        # Not constant_memory: to_excel writes cell by cell down each column,
+        # and constant_memory silently drops writes to already-flushed rows
+        with pd.ExcelWriter(buffer, engine='xlsxwriter',
+                            engine_kwargs={'options': {'in_memory': True}}) as writer:
+            # Summary sheet
+            summary_df.to_excel(writer, sheet_name='Summary', index=False)
+            
+            # Orders data
+            orders_df.to_excel(writer, sheet_name='Orders', index=False)
+            
+            # Inventory data
+            inventory_df.to_excel(writer, sheet_name='Inventory', index=False)
+    return buffer.getvalue()
 
 def main():
     """
@@ -26,32 +126,13 @@ def main():
     st.title("📊 Supply Chain Analytics Dashboard")
     st.markdown("---")
     
-    # Create sample data
-    sample_orders = pd.DataFrame({
-        'Order ID': [f'ORD_{i:03d}' for i in range(1, 101)],
-        'Order Date': pd.date_range('2024-01-01', periods=100, freq='D'),
-        'Ship Date': pd.date_range('2024-01-03', periods=100, freq='D'),
-        'Customer ID': [f'CUST_{i%20:02d}' for i in range(1, 101)],
-        'Product ID': [f'PROD_{i%10:02d}' for i in range(1, 101)],
-        'Category': ['Electronics', 'Clothing', 'Home', 'Sports'] * 25,
-        'Quantity': np.random.randint(1, 10, 100),
-        'Sales': np.random.uniform(100, 1000, 100),
-        'Profit': np.random.uniform(10, 200, 100),
-        'Lead Time (Days)': np.random.randint(1, 15, 100)
-    })
+    # Sample data (cached across reruns)
+    sample_orders = build_orders()
+    sample_inventory = build_inventory()
     
-    # Create inventory data with consistent lengths
-    num_inventory_records = 300
-    sample_inventory = pd.DataFrame({
-        'date': pd.date_range('2024-01-01', periods=30, freq='D').repeat(num_inventory_records // 30),
-        'product_id': [f'PROD_{i%10:02d}' for i in range(1, num_inventory_records + 1)],
-        'category': ['Electronics', 'Clothing', 'Home', 'Sports'] * (num_inventory_records // 4),
-        'stock_level': np.random.randint(10, 200, num_inventory_records),
-        'daily_demand': np.random.randint(1, 10, num_inventory_records),
-        'fill_rate': np.random.uniform(0.7, 1.0, num_inventory_records),
-        'annualized_turnover': np.random.uniform(2, 12, num_inventory_records),
-        'stockout_risk': np.random.choice([True, False], num_inventory_records, p=[0.1, 0.9])
-    })
+    lead_time_summary = lead_time_stats(sample_orders)
+    inventory_summary = inventory_means(sample_inventory)
+    risk_count = int(sample_inventory['stockout_risk'].sum())
     
     # KPI Cards
     col1, col2, col3, col4 = st.columns(4)
@@ -64,7 +145,7 @@ def main():
         )
     
     with col2:
-        avg_lead_time = sample_orders['Lead Time (Days)'].mean()
+        avg_lead_time = lead_time_summary['mean']
         st.metric(
             label="⏱️ Avg Lead Time",
             value=f"{avg_lead_time:.1f} days",
@@ -72,7 +153,7 @@ def main():
         )
     
     with col3:
-        fill_rate = sample_inventory['fill_rate'].mean()
+        fill_rate = inventory_summary['fill_rate']
         st.metric(
             label="📈 Fill Rate",
             value=f"{fill_rate:.1%}",
@@ -80,7 +161,7 @@ def main():
         )
     
     with col4:
-        turnover = sample_inventory['annualized_turnover'].mean()
+        turnover = inventory_summary['annualized_turnover']
         st.metric(
             label="🔄 Inventory Turnover",
             value=f"{turnover:.1f}x",
@@ -93,95 +174,36 @@ def main():
     col1, col2 = st.columns(2)
     
     with col1:
+        from dashboard.charts import lead_time_histogram, stock_level_chart
+        
         st.subheader("📊 Lead Time Distribution")
-        fig = px.histogram(
-            sample_orders,
-            x='Lead Time (Days)',
-            nbins=20,
-            title="Lead Time Distribution"
-        )
-        fig.update_layout(
-            xaxis_title="Lead Time (Days)",
-            yaxis_title="Number of Orders",
-            showlegend=False
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(lead_time_histogram(sample_orders), use_container_width=True)
         
         st.subheader("📦 Inventory Trends")
-        daily_inventory = sample_inventory.groupby(['date', 'category']).agg({
-            'stock_level': 'mean',
-            'daily_demand': 'mean'
-        }).reset_index()
-        
-        fig = px.line(
-            daily_inventory,
-            x='date',
-            y='stock_level',
-            color='category',
-            title="Daily Stock Levels by Category"
-        )
-        fig.update_layout(
-            xaxis_title="Date",
-            yaxis_title="Stock Level",
-            hovermode='x unified'
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(stock_level_chart(sample_inventory), use_container_width=True)
     
     with col2:
-        st.subheader("🏷️ Category Performance")
-        category_sales = sample_orders.groupby('Category').agg({
-            'Sales': 'sum',
-            'Order ID': 'count'
-        }).reset_index()
+        from dashboard.charts import category_sales_chart, fill_rate_chart
         
-        fig = px.bar(
-            category_sales,
-            x='Category',
-            y='Sales',
-            title="Sales by Category",
-            text='Sales'
-        )
-        fig.update_traces(texttemplate='%{text:,.0f}', textposition='outside')
-        fig.update_layout(
-            xaxis_title="Category",
-            yaxis_title="Total Sales ($)",
-            xaxis_tickangle=-45
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.subheader("🏷️ Category Performance")
+        st.plotly_chart(category_sales_chart(sample_orders), use_container_width=True)
         
         st.subheader("📈 Fill Rate Analysis")
-        fill_rate_by_category = sample_inventory.groupby('category')['fill_rate'].mean().reset_index()
-        
-        fig = px.bar(
-            fill_rate_by_category,
-            x='category',
-            y='fill_rate',
-            title="Average Fill Rate by Category",
-            text='fill_rate'
-        )
-        fig.update_traces(texttemplate='%{text:.1%}', textposition='outside')
-        fig.update_layout(
-            xaxis_title="Category",
-            yaxis_title="Fill Rate",
-            yaxis_tickformat='.1%',
-            xaxis_tickangle=-45
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(fill_rate_chart(sample_inventory), use_container_width=True)
     
     # Alerts section
     st.subheader("🚨 Alerts & Notifications")
     
     alerts = []
     
-    # Check for low inventory
-    low_stock_products = sample_inventory[sample_inventory['stockout_risk'] == True]
-    if len(low_stock_products) > 0:
-        alerts.append(f"⚠️ {len(low_stock_products)} products at risk of stockout")
+    # Check for low inventory (count the mask; no filtered copy)
+    if risk_count > 0:
+        alerts.append(f"⚠️ {risk_count} products at risk of stockout")
     
     # Check for high lead times
-    high_lead_time = sample_orders[sample_orders['Lead Time (Days)'] > 14]
-    if len(high_lead_time) > 0:
-        alerts.append(f"⚠️ {len(high_lead_time)} orders with lead time > 14 days")
+    high_lead_time_count = int((sample_orders['Lead Time (Days)'] > 14).sum())
+    if high_lead_time_count > 0:
+        alerts.append(f"⚠️ {high_lead_time_count} orders with lead time > 14 days")
     
     if alerts:
         for alert in alerts:
@@ -200,14 +222,14 @@ def main():
         
         with col1:
             st.subheader("Lead Time Metrics")
-            st.metric("Mean Lead Time", f"{sample_orders['Lead Time (Days)'].mean():.1f} days")
-            st.metric("Median Lead Time", f"{sample_orders['Lead Time (Days)'].median():.1f} days")
-            st.metric("Standard Deviation", f"{sample_orders['Lead Time (Days)'].std():.1f} days")
+            st.metric("Mean Lead Time", f"{lead_time_summary['mean']:.1f} days")
+            st.metric("Median Lead Time", f"{lead_time_summary['median']:.1f} days")
+            st.metric("Standard Deviation", f"{lead_time_summary['std']:.1f} days")
         
         with col2:
             st.subheader("Fill Rate Metrics")
-            st.metric("Mean Fill Rate", f"{sample_inventory['fill_rate'].mean():.1%}")
-            st.metric("Products at Risk", sample_inventory['stockout_risk'].sum())
+            st.metric("Mean Fill Rate", f"{inventory_summary['fill_rate']:.1%}")
+            st.metric("Products at Risk", risk_count)
             st.metric("Total Products", len(sample_inventory))
     
     with tab2:
@@ -215,34 +237,23 @@ def main():
         
         with col1:
             st.subheader("Inventory Turnover")
-            turnover_stats = sample_inventory['annualized_turnover'].describe()
-            st.dataframe(turnover_stats)
+            q25, median, q75 = turnover_quartiles(sample_inventory)
+            st.metric("Mean Turnover", f"{inventory_summary['annualized_turnover']:.1f}x")
+            st.metric("Median Turnover", f"{median:.1f}x")
+            st.metric("Interquartile Range", f"{q25:.1f}x - {q75:.1f}x")
         
         with col2:
             st.subheader("Stockout Risk")
-            risk_count = sample_inventory['stockout_risk'].sum()
             total_count = len(sample_inventory)
             st.metric("Products at Risk", f"{risk_count} / {total_count}")
     
     with tab3:
+        from dashboard.charts import monthly_lead_time_chart
+        
         st.subheader("Fulfillment Performance")
         
         # Monthly trends
-        sample_orders['Order Month'] = sample_orders['Order Date'].dt.to_period('M')
-        monthly_lead_time = sample_orders.groupby('Order Month')['Lead Time (Days)'].mean()
-        
-        fig = px.line(
-            x=monthly_lead_time.index.astype(str),
-            y=monthly_lead_time.values,
-            title="Monthly Average Lead Time"
-        )
-        
-        fig.update_layout(
-            xaxis_title="Month",
-            yaxis_title="Average Lead Time (Days)"
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(monthly_lead_time_chart(sample_orders), use_container_width=True)
     
     # Sidebar
     st.sidebar.header("📊 Dashboard Filters")
@@ -266,17 +277,21 @@ def main():
     st.sidebar.header("📈 Quick Actions")
     
     if st.sidebar.button("🔄 Refresh Data"):
+        # Drop the cached sample data so the rerun draws new values
+        build_orders.clear()
+        build_inventory.clear()
         st.rerun()
     
+    export_format = st.sidebar.radio("Export Format", ['xlsx', 'parquet'], horizontal=True)
     if st.sidebar.button("📊 Export Report"):
         # Create a comprehensive report
         report_data = {
             'summary': {
                 'total_orders': len(sample_orders),
-                'avg_lead_time': sample_orders['Lead Time (Days)'].mean(),
-                'fill_rate': sample_inventory['fill_rate'].mean(),
-                'inventory_turnover': sample_inventory['annualized_turnover'].mean(),
-                'products_at_risk': sample_inventory['stockout_risk'].sum()
+                'avg_lead_time': lead_time_summary['mean'],
+                'fill_rate': inventory_summary['fill_rate'],
+                'inventory_turnover': inventory_summary['annualized_turnover'],
+                'products_at_risk': risk_count
             },
             'orders_data': sample_orders,
             'inventory_data': sample_inventory
@@ -284,22 +299,25 @@ def main():
         
         # Create report filename with timestamp
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        report_filename = f"supply_chain_report_{timestamp}.xlsx"
+        report_name = f"supply_chain_report_{timestamp}"
+        summary_df = pd.DataFrame([report_data['summary']])
         
-        # Save to Excel file
-        with pd.ExcelWriter(report_filename, engine='openpyxl') as writer:
-            # Summary sheet
-            summary_df = pd.DataFrame([report_data['summary']])
-            summary_df.to_excel(writer, sheet_name='Summary', index=False)
-            
-            # Orders data
-            report_data['orders_data'].to_excel(writer, sheet_name='Orders', index=False)
-            
-            # Inventory data
-            report_data['inventory_data'].to_excel(writer, sheet_name='Inventory', index=False)
+        report_bytes = build_report(summary_df, report_data['orders_data'],
+                                    report_data['inventory_data'], export_format)
+        if export_format == 'parquet':
+            report_filename = f"{report_name}.zip"
+            mime = "application/zip"
+        else:
+            report_filename = f"{report_name}.xlsx"
+            mime = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
         
-        st.success(f"📊 Report exported successfully to: {report_filename}")
-        st.info(f"📁 File saved in: {os.getcwd()}")
+        st.sidebar.download_button(
+            "⬇️ Download Report",
+            report_bytes,
+            file_name=report_filename,
+            mime=mime
+        )
+        st.success(f"📊 Report ready: {report_filename}")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,106 @@
+"""
+Tests for data_warehouse.bigquery_connector that run without BigQuery access
+"""
+
+import re
+import unittest
+from concurrent.futures import Future
+from datetime import date
+from unittest import mock
+
+import pandas as pd
+from google.cloud.bigquery_storage_v1 import types
+
+from data_warehouse.bigquery_connector import BigQueryConnector, MART_QUERIES, _mart_start_date
+
+class MartWindowTest(unittest.TestCase):
+    """
+    The start date filled into MART_QUERIES by create_data_marts
+    """
+    
+    def setUp(self):
+        self.connector = BigQueryConnector()
+        self.connector._client = mock.MagicMock()
+        self.connector._clients_initialized = True
+    
+    def rendered_dates(self, *args):
+        """
+        Run create_data_marts and return every DATE literal in its queries
+        """
+        self.assertTrue(self.connector.create_data_marts(*args))
+        queries = [call.args[0] for call in self.connector._client.query.call_args_list]
+        self.assertEqual(len(queries), len(MART_QUERIES))
+        for query in queries:
+            self.assertNotIn("{", query)
+        return {d for query in queries for d in re.findall(r"DATE '([^']*)'", query)}
+    
+    def test_default_reads_all_history(self):
+        # test.xlsx orders run from 2015-01-03, long before any recent window
+        self.assertEqual(self.rendered_dates(), {"0001-01-01"})
+    
+    def test_window_counts_back_from_today(self):
+        with mock.patch("data_warehouse.bigquery_connector.date") as fake_date:
+            fake_date.today.return_value = date(2018, 12, 31)
+            self.assertEqual(self.rendered_dates(30), {"2018-12-01"})
+    
+    def test_start_date(self):
+        self.assertEqual(_mart_start_date(None), "0001-01-01")
+        self.assertEqual(_mart_start_date(365, today=date(2019, 1, 1)), "2018-01-01")
+
+class StreamWriteJobTest(unittest.TestCase):
+    """
+    A Storage Write load closes and commits its stream exactly once, however
+    many times its outcome is asked for
+    """
+    
+    def setUp(self):
+        self.connector = BigQueryConnector()
+        self.connector._client = mock.MagicMock()
+        self.write_client = mock.MagicMock()
+        self.write_client.table_path.side_effect = "projects/{}/datasets/{}/tables/{}".format
+        self.write_client.create_write_stream.return_value = types.WriteStream(name="stream")
+        self.write_client.batch_commit_write_streams.return_value = types.BatchCommitWriteStreamsResponse()
+        self.connector._write_client = self.write_client
+        self.connector._clients_initialized = True
+        
+        patcher = mock.patch("data_warehouse.bigquery_connector.writer.AppendRowsStream")
+        self.append_rows_stream = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+    
+    def run_load(self):
+        """
+        Submit a small fact load and wait for it the way load_data_to_bigquery
+        does: a done callback logs the outcome, which asks the job again
+        """
+        job = self.connector._submit_stream(pd.DataFrame({"order_id": ["ORD_001"]}), "fact_orders")
+        logged = Future()
+        job.add_done_callback(lambda finished: self.connector._log_load_result("Orders fact", logged, finished))
+        logged.result(timeout=5)
+        return job
+    
+    def test_success_commits_once(self):
+        job = self.run_load()
+        
+        self.assertIsNone(job.exception())
+        self.assertIs(job.result(), job)
+        self.write_client.finalize_write_stream.assert_called_once()
+        self.write_client.batch_commit_write_streams.assert_called_once()
+        self.append_rows_stream.close.assert_called_once()
+    
+    def test_failure_commits_once(self):
+        self.write_client.batch_commit_write_streams.side_effect = RuntimeError("commit rejected")
+        job = self.run_load()
+        
+        self.assertIsInstance(job.exception(), RuntimeError)
+        with self.assertRaisesRegex(RuntimeError, "commit rejected"):
+            job.result()
+        self.write_client.finalize_write_stream.assert_called_once()
+        self.write_client.batch_commit_write_streams.assert_called_once()
+        self.append_rows_stream.close.assert_called_once()
+        
+        # The rejected rows never reach the fact table
+        queries = [call.args[0] for call in self.connector._client.query.call_args_list]
+        self.assertFalse(any("TRUNCATE" in query for query in queries))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,60 +1,71 @@
 import logging
 import os
 from datetime import datetime
-from config import LOG_LEVEL, LOG_FILE
+from logging.handlers import RotatingFileHandler
+from config import LOG_LEVEL, LOG_FILE, LOG_MAX_BYTES, LOG_BACKUP_COUNT, LOG_TO_CONSOLE
 
 def setup_logger(name="supply_chain_pipeline"):
     """
-    Set up a logger with file and console handlers
+    Set up a logger with file and console handlers (once per logger name)
     """
+    logger = logging.getLogger(name)
+    
+    # Already configured: reuse its handlers instead of reopening the log file
+    if logger.handlers:
+        return logger
+    
     # Create logs directory if it doesn't exist
     os.makedirs("logs", exist_ok=True)
     
-    # Configure logger
-    logger = logging.getLogger(name)
+    # Configure logger; records are handled here only, not again by the root logger
     logger.setLevel(getattr(logging, LOG_LEVEL.upper()))
-    
-    # Clear existing handlers
-    logger.handlers.clear()
+    logger.propagate = False
     
     # Create formatters
     formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
     
-    # File handler
-    file_handler = logging.FileHandler(f"logs/{LOG_FILE}")
+    # File handler, rotated by size; the file is opened on the first record
+    file_handler = RotatingFileHandler(
+        f"logs/{LOG_FILE}", maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, delay=True
+    )
     file_handler.setLevel(logging.INFO)
     file_handler.setFormatter(formatter)
+    logger.addHandler(file_handler)
     
     # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(formatter)
-    
-    # Add handlers to logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    if LOG_TO_CONSOLE:
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(logging.INFO)
+        console_handler.setFormatter(formatter)
+        logger.addHandler(console_handler)
     
     return logger
 
+# Log level for each pipeline step status / data quality result / alert severity
+STEP_LEVELS = {"STARTED": logging.INFO, "COMPLETED": logging.INFO,
+               "ERROR": logging.ERROR, "WARNING": logging.WARNING}
+CHECK_LEVELS = {"PASS": logging.INFO, "FAIL": logging.ERROR, "WARNING": logging.WARNING}
+ALERT_LEVELS = {"CRITICAL": logging.CRITICAL, "ERROR": logging.ERROR, "WARNING": logging.WARNING}
+
+def _log(logger, level, message, args, details):
+    """
+    Log with %-style args so formatting only happens for enabled levels
+    """
+    if level is None or not logger.isEnabledFor(level):
+        return
+    if details:
+        logger.log(level, message + " - Details: %s", *args, details)
+    else:
+        logger.log(level, message, *args)
+
 def log_pipeline_step(step_name, status="STARTED", details=None):
     """
     Log pipeline step execution
     """
     logger = setup_logger()
-    message = f"Pipeline Step: {step_name} - {status}"
-    if details:
-        message += f" - Details: {details}"
-    
-    if status == "STARTED":
-        logger.info(message)
-    elif status == "COMPLETED":
-        logger.info(message)
-    elif status == "ERROR":
-        logger.error(message)
-    elif status == "WARNING":
-        logger.warning(message)
+    _log(logger, STEP_LEVELS.get(status), "Pipeline Step: %s - %s", (step_name, status), details)
     
     return logger
 
@@ -63,16 +74,7 @@ def log_data_quality_check(check_name, result, details=None):
     Log data quality check results
     """
     logger = setup_logger()
-    message = f"Data Quality Check: {check_name} - Result: {result}"
-    if details:
-        message += f" - Details: {details}"
-    
-    if result == "PASS":
-        logger.info(message)
-    elif result == "FAIL":
-        logger.error(message)
-    elif result == "WARNING":
-        logger.warning(message)
+    _log(logger, CHECK_LEVELS.get(result), "Data Quality Check: %s - Result: %s", (check_name, result), details)
     
     return logger
 
@@ -81,15 +83,6 @@ def log_alert(alert_type, message, severity="INFO"):
     Log alerts for monitoring
     """
     logger = setup_logger()
-    alert_message = f"ALERT [{alert_type}]: {message}"
+    _log(logger, ALERT_LEVELS.get(severity, logging.INFO), "ALERT [%s]: %s", (alert_type, message), None)
     
-    if severity == "CRITICAL":
-        logger.critical(alert_message)
-    elif severity == "ERROR":
-        logger.error(alert_message)
-    elif severity == "WARNING":
-        logger.warning(alert_message)
-    else:
-        logger.info(alert_message)
-    
-    return logger 
\ No newline at end of file
+    return logger